@@ -2,19 +2,29 @@
 Main Flask application entry point
 """
 
+import logging
 import os
-from flask import Flask, send_from_directory
+from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
+from flask_compress import Compress
 from flask_mail import Mail
 from flask_session import Session
 from flask_jwt_extended import JWTManager
+from werkzeug.exceptions import BadRequest
+from werkzeug.middleware.proxy_fix import ProxyFix
 from config import config
 from models import db
 from routes import register_blueprints
+from utils.cache import cache
+from utils.json_provider import OrjsonProvider
 from utils.migration_manager import init_migrations
+from utils.rate_limit import limiter
+
+logger = logging.getLogger(__name__)
 
 # Initialize extensions
 mail = Mail()
+compress = Compress()
 jwt = JWTManager()  # Proper JWT initialization
 
 
@@ -22,33 +32,70 @@ def create_app(config_name=None):
     """
     Flask application factory
     """
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        format="%(asctime)s %(levelname)s %(name)s %(message)s",
+        force=True,  # Override service modules that call basicConfig at import
+    )
+
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
 
     # Load configuration
     config_name = config_name or os.getenv("FLASK_CONFIG", "default")
     app.config.from_object(config[config_name])
 
-    # Load frontend URL from environment (for password reset links)
-    app.config['FRONTEND_BASE_URL'] = os.getenv('FRONTEND_BASE_URL', 'http://localhost:5173')
+    # Derive remote_addr from trusted proxy hops only (used for rate limiting)
+    if app.config.get("PROXY_FIX_X_FOR"):
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["PROXY_FIX_X_FOR"])
 
-        
-    # Load backend URL from environment (for file uploads)
-    app.config['BACKEND_BASE_URL'] = os.getenv('BACKEND_BASE_URL', 'http://localhost:5000')
+    # FRONTEND_BASE_URL / BACKEND_BASE_URL are loaded from the environment by Config
 
     # Initialize core extensions
     db.init_app(app)
     mail.init_app(app)
+    compress.init_app(app)
+    if app.config.get("SESSION_TYPE") == "redis":
+        import redis
+        app.config["SESSION_REDIS"] = redis.from_url(app.config["REDIS_URL"])
     Session(app)
     jwt.init_app(app)
+    limiter.init_app(app)
+    cache.init_app(app)
+    if app.config.get("NPLUSONE_ENABLED"):
+        # Dev-only: log (or raise on) lazy loads that cause N+1 queries
+        from nplusone.ext.flask_sqlalchemy import NPlusOne
+        NPlusOne(app)
 
     # Upload folder setup
     app.config["UPLOAD_FOLDER"] = os.path.join(os.getcwd(), "backend", "uploads")
     os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)  # Ensure folder exists
 
-    @app.route("/uploads/<path:filename>")
-    def uploaded_file(filename):
-        """Serve uploaded files"""
-        return send_from_directory(app.config["UPLOAD_FOLDER"], filename)
+    if app.config.get("SERVE_UPLOADS_FROM_FLASK", True):
+        @app.route("/uploads/<path:filename>")
+        def uploaded_file(filename):
+            """Serve uploaded files (dev fallback when nginx/CDN is not in front)"""
+            return send_from_directory(app.config["UPLOAD_FOLDER"], filename, max_age=3600)
+
+    @app.before_request
+    def reject_malformed_json():
+        """Answer unparsable JSON bodies with 400 before any view runs"""
+        # get_json caches the parsed body, so views do not parse it again
+        if request.is_json and request.get_data():
+            try:
+                request.get_json()
+            except BadRequest:  # only real parse failures (a literal null body is valid)
+                return jsonify({"error": "Malformed JSON body"}), 400
+
+    @app.errorhandler(413)
+    def request_too_large(e):
+        """JSON body for uploads over MAX_CONTENT_LENGTH"""
+        return jsonify({"error": "Upload too large"}), 413
+
+    @app.errorhandler(429)
+    def rate_limited(e):
+        """JSON body for Flask-Limiter rejections"""
+        return jsonify({"error": f"Too many requests: {e.description}"}), 429
 
     # Register all API blueprints
     register_blueprints(app)
@@ -70,10 +117,17 @@ def create_app(config_name=None):
             "x-user-email",
             "x-user-name",
         ],
+        max_age=86400,  # Let browsers cache preflight responses for a day
     )
 
-    # Initialize database and run migrations
-    if not app.config.get("TESTING", False):
+    @app.cli.command("init-db")
+    def init_db_command():
+        """Run migrations, create tables, and seed defaults"""
+        initialize_database(app)
+
+    # Initialize database and run migrations only when explicitly requested;
+    # web workers skip this and deploys run `flask --app app init-db` once
+    if not app.config.get("TESTING", False) and os.getenv("RUN_DB_INIT") == "1":
         initialize_database(app)
 
     return app
@@ -83,52 +137,33 @@ def initialize_database(app):
     """Run migrations, create tables, and seed defaults"""
     with app.app_context():
         try:
-            print("\n🔧 Running custom migrations...")
+            logger.info("🔧 Running custom migrations...")
             init_migrations(app, db)
 
             # Create all tables
             db.create_all()
-            print("✅ Database tables created successfully!")
-
-            # Ensure column exists in purchase_order table
-            from sqlalchemy import text
-            result = db.session.execute(
-                text(
-                    """
-                    SELECT COLUMN_NAME 
-                    FROM INFORMATION_SCHEMA.COLUMNS 
-                    WHERE TABLE_SCHEMA = DATABASE() 
-                    AND TABLE_NAME = 'purchase_order' 
-                    AND COLUMN_NAME = 'original_requirements'
-                    """
-                )
-            )
-            if not result.fetchone():
-                print("🔄 Adding missing 'original_requirements' column...")
-                db.session.execute(
-                    text("ALTER TABLE purchase_order ADD COLUMN original_requirements TEXT")
-                )
-                db.session.commit()
-                print("✅ Column added successfully!")
-            else:
-                print("ℹ️ 'original_requirements' column already exists")
+            logger.info("✅ Database tables created successfully!")
 
             # Ensure admin user exists
             from models import User
             admin_created = User.create_admin_user()
             if admin_created:
-                print("✅ Admin user created successfully!")
+                logger.info("✅ Admin user created successfully!")
             else:
-                print("ℹ️ Admin user already exists")
+                logger.info("ℹ️ Admin user already exists")
 
         except Exception as e:
-            print(f"❌ Error setting up database: {e}")
+            logger.exception("❌ Error setting up database: %s", e)
             raise
 
 
-# Run Flask app (Render/Railway will use gunicorn in production)
+# Development server only; production runs: gunicorn -c gunicorn.conf.py wsgi:app
 if __name__ == "__main__":
     app = create_app()
+    # The debug reloader re-executes this module in a child process
+    # (WERKZEUG_RUN_MAIN=true); initialize the database only once
+    if os.getenv("WERKZEUG_RUN_MAIN") != "true" and os.getenv("RUN_DB_INIT") != "1":
+        initialize_database(app)
     app.run(
         debug=app.config.get("DEBUG", True),
         host="0.0.0.0",
@@ -19,8 +19,11 @@ class Config:
     SQLALCHEMY_DATABASE_URI = f'mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}/{MYSQL_DATABASE}'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.getenv('DB_POOL_PER_WORKER', 5)),  # Per-worker pool, see gunicorn.conf.py
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 2)),
         'pool_pre_ping': True,
-        'pool_recycle': 300,
+        'pool_recycle': 280,
+        'pool_use_lifo': True,  # Reuse the hottest connections, let idle ones expire
         'isolation_level': 'READ COMMITTED',  # Ensure we always read committed data
         'echo': False,  # Set to True for SQL debugging
     }
@@ -29,11 +32,37 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key-change-in-production')
     DEBUG = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
 
+    # Redis (shared state across Gunicorn workers)
+    REDIS_URL = os.getenv('REDIS_URL')
+
     # Session Configuration
-    SESSION_TYPE = 'filesystem'  # Use filesystem for session storage
+    # Redis-backed sessions are shared by all workers; filesystem is local-dev only
+    SESSION_TYPE = 'redis' if REDIS_URL else 'filesystem'
     SESSION_PERMANENT = False
     SESSION_USE_SIGNER = True
 
+    # Number of reverse proxies in front of the app (nginx/load balancer) whose
+    # X-Forwarded-For entry is trusted; 0 = clients connect directly.
+    # Deployments behind one proxy (nginx or the platform load balancer) set 1;
+    # left at 0 there, every client shares the proxy IP for per-IP rate limits.
+    PROXY_FIX_X_FOR = int(os.getenv('PROXY_FIX_X_FOR', 0))
+
+    # Rate limiting (Flask-Limiter); counters live in Redis when available.
+    # memory:// keeps separate counters per Gunicorn worker (limit x workers)
+    RATELIMIT_STORAGE_URI = REDIS_URL or 'memory://'
+    RATELIMIT_HEADERS_ENABLED = True
+
+    # Response cache for polled dashboards (Flask-Caching)
+    CACHE_TYPE = 'RedisCache' if REDIS_URL else 'SimpleCache'
+    CACHE_REDIS_URL = REDIS_URL
+    CACHE_KEY_PREFIX = 'erp:'
+    CACHE_DEFAULT_TIMEOUT = 30
+
+    # Response compression (Flask-Compress)
+    COMPRESS_MIMETYPES = ['application/json', 'text/html', 'text/css', 'application/javascript']
+    COMPRESS_LEVEL = 5
+    COMPRESS_MIN_SIZE = 512
+
     # CORS Configuration
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*')
 
@@ -51,10 +80,21 @@ class Config:
     # Backend URL for file uploads
     BACKEND_BASE_URL = os.getenv('BACKEND_BASE_URL', 'http://localhost:5000')
 
+    # Reject request bodies (photo uploads) over this size with 413 before reading them
+    MAX_CONTENT_LENGTH = int(os.getenv('MAX_UPLOAD_MB', 16)) * 1024 * 1024
+
+    # Serve /uploads from Flask; disable when nginx/CDN serves the uploads folder, e.g.
+    #   location /uploads/ { alias /app/backend/backend/uploads/; sendfile on; expires 1h; }
+    SERVE_UPLOADS_FROM_FLASK = os.getenv('SERVE_UPLOADS_FROM_FLASK', 'True').lower() == 'true'
+
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
 
+    # N+1 query detection (pip install nplusone); off unless requested
+    NPLUSONE_ENABLED = os.getenv('NPLUSONE_ENABLED', 'False').lower() == 'true'
+    NPLUSONE_RAISE = os.getenv('NPLUSONE_RAISE', 'False').lower() == 'true'
+
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
@@ -63,6 +103,9 @@ class TestConfig(Config):
     """Testing configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {}  # SQLite in-memory does not accept MySQL pool options
+    RATELIMIT_ENABLED = False
+    CACHE_TYPE = 'NullCache'
 
 # Configuration dictionary
 config = {
@@ -0,0 +1,78 @@
+"""
+Gunicorn configuration for the Production Management System
+
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+Run database migrations once per deploy (not per worker): flask --app app init-db
+Behind a reverse proxy set PROXY_FIX_X_FOR=1 (one trusted hop) and REDIS_URL
+so per-IP rate limits see real clients and are shared across workers.
+"""
+import multiprocessing
+import os
+
+# Server socket
+bind = "0.0.0.0:" + os.getenv("PORT", "5000")
+
+# Database connection budget: every worker opens its own SQLAlchemy pool
+db_max_connections = int(os.getenv("DB_MAX_CONNECTIONS", 40))
+db_pool_per_worker = int(os.getenv("DB_POOL_PER_WORKER", 5))
+db_max_overflow = int(os.getenv("DB_MAX_OVERFLOW", 2))
+
+# Worker processes (gthread threads cover I/O-bound DB and mail handlers),
+# capped so the combined pools never exceed MySQL max_connections
+workers = min(
+    int(os.getenv("WEB_CONCURRENCY", 2 * multiprocessing.cpu_count() + 1)),
+    max(1, db_max_connections // (db_pool_per_worker + db_max_overflow)),
+)
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+
+# Worker heartbeat files on tmpfs; a disk-backed /tmp can stall heartbeats
+# in containers and get healthy workers killed
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+# Keep client connections open between requests
+keepalive = 120
+
+# Use sendfile(2) for file responses (uploads served by Flask)
+sendfile = True
+
+# Build the app once in the master so forked workers share memory pages
+preload_app = True
+
+
+def when_ready(server):
+    """Log the resolved worker/pool sizing on boot"""
+    server.log.info(
+        "Gunicorn ready: workers=%s threads=%s worker_class=%s db_pool_per_worker=%s db_max_overflow=%s db_max_connections=%s",
+        workers, threads, worker_class, db_pool_per_worker, db_max_overflow, db_max_connections,
+    )
+    from wsgi import app
+    if workers > 1 and app.config.get("CACHE_TYPE") == "SimpleCache":
+        # SimpleCache is per process: invalidations never reach the other workers
+        server.log.warning(
+            "CACHE_TYPE=SimpleCache with %s workers: cached responses can stay stale for up to "
+            "CACHE_DEFAULT_TIMEOUT (%ss) after writes; set REDIS_URL to share the cache",
+            workers, app.config.get("CACHE_DEFAULT_TIMEOUT"),
+        )
+    if workers > 1 and app.config.get("RATELIMIT_STORAGE_URI", "").startswith("memory://"):
+        # Each worker counts separately, so the effective limit is N x the configured one
+        server.log.warning(
+            "RATELIMIT_STORAGE_URI=memory:// with %s workers: rate limits are enforced per worker; "
+            "set REDIS_URL to share the counters",
+            workers,
+        )
+    if not app.config.get("PROXY_FIX_X_FOR"):
+        server.log.warning(
+            "PROXY_FIX_X_FOR=0: rate limits key on the socket peer address; behind a reverse "
+            "proxy all clients share its IP, so set PROXY_FIX_X_FOR to the number of proxies (usually 1)"
+        )
+
+
+def post_fork(server, worker):
+    """Drop DB pool connections inherited from the preloaded master"""
+    from wsgi import app
+    from models import db
+    with app.app_context():
+        # close=False leaves the parent's sockets alone; the worker opens fresh ones
+        db.engine.dispose(close=False)
@@ -18,7 +18,7 @@ from .transport import PartLoadDetail
 from .approval import ApprovalRequest
 from .password_reset_token import PasswordResetToken
 from .hr import Employee, Attendance, Leave, Payroll, JobPosting, LeaveType, LeaveStatus, AttendanceStatus, JobStatus, SalaryType, JobApplication, Interview, Candidate, ApplicationStatus, InterviewStatus
-from .gate_entry import GateUser, GateEntryLog, GoingOutLog, GateEntrySession
+from .gate_entry import GateUser, GateFaceRegistry, GateEntryLog, GoingOutLog, GateEntrySession
 from .guest_list import GuestList, GuestStatus
 from .audit_trail import AuditTrail, AuditAction, AuditModule
 
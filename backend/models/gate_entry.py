@@ -2,6 +2,8 @@
 Gate Entry System Models
 """
 from datetime import datetime
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects.mysql import MEDIUMBLOB
 from utils.timezone_helpers import get_ist_now
 from models import db
 
@@ -13,7 +15,7 @@ class GateUser(db.Model):
     name = db.Column(db.String(200), nullable=False)
     phone = db.Column(db.String(20), unique=True, nullable=False, index=True)
     photo = db.Column(db.Text, nullable=True)  # Base64 encoded photo
-    face_encoding = db.Column(db.Text, nullable=True)  # Serialized face encodings (JSON array) - LONGTEXT in DB for 7 encodings (~292KB)
+    face_encoding = db.Column(db.LargeBinary().with_variant(MEDIUMBLOB, 'mysql'), nullable=True)  # Face encodings as a (n, 100, 100) uint8 .npy blob (~70KB for 7 encodings)
     status = db.Column(db.String(50), default='active')  # active, inactive, blocked
     registered_at = db.Column(db.DateTime, default=get_ist_now)
     last_entry = db.Column(db.DateTime, nullable=True)
@@ -28,15 +30,9 @@ class GateUser(db.Model):
     
     def to_dict(self):
         """Convert model instance to dictionary"""
-        has_face_encoding = self.face_encoding is not None and self.face_encoding.strip() != '' and self.face_encoding != '[]'
-        try:
-            if has_face_encoding:
-                import json
-                encoding_data = json.loads(self.face_encoding)
-                has_face_encoding = isinstance(encoding_data, list) and len(encoding_data) > 0
-        except:
-            has_face_encoding = False
-            
+        # Empty encodings are stored as NULL; '[]' can only come from legacy JSON rows
+        has_face_encoding = bool(self.face_encoding) and self.face_encoding not in (b'[]', '[]')
+
         return {
             'id': self.id,
             'name': self.name,
@@ -52,6 +48,41 @@ class GateUser(db.Model):
         }
 
 
+class GateFaceRegistry(db.Model):
+    """Single-row counter bumped whenever registered face encodings change"""
+    __tablename__ = 'gate_face_registry'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)  # Only ever increases
+
+
+def _bump_face_registry(connection):
+    """Advance the face registry version in the flushing transaction"""
+    table = GateFaceRegistry.__table__
+    result = connection.execute(
+        table.update().where(table.c.id == 1).values(version=table.c.version + 1)
+    )
+    if not result.rowcount:
+        connection.execute(table.insert().values(id=1, version=1))
+
+
+@event.listens_for(GateUser, 'after_insert')
+def _face_registered(mapper, connection, target):
+    if target.face_encoding is not None:
+        _bump_face_registry(connection)
+
+
+@event.listens_for(GateUser, 'after_update')
+def _face_updated(mapper, connection, target):
+    if inspect(target).attrs.face_encoding.history.has_changes():
+        _bump_face_registry(connection)
+
+
+@event.listens_for(GateUser, 'after_delete')
+def _face_deleted(mapper, connection, target):
+    _bump_face_registry(connection)
+
+
 class GateEntryLog(db.Model):
     """Model for gate entry/exit logs"""
     __tablename__ = 'gate_entry_logs'
@@ -41,6 +41,12 @@ class GuestList(db.Model):
     created_at = db.Column(db.DateTime, default=get_ist_now)
     updated_at = db.Column(db.DateTime, default=get_ist_now, onupdate=get_ist_now)
     
+    # Guest list filters by status/date range and sorts by visit date
+    __table_args__ = (
+        db.Index('ix_guest_list_status_visit_date', 'status', 'visit_date'),
+        db.Index('ix_guest_list_visit_date_created', 'visit_date', 'created_at'),
+    )
+    
     def to_dict(self):
         """Convert guest list entry to dictionary"""
         return {
@@ -1,4 +1,6 @@
 from datetime import datetime, timedelta
+from sqlalchemy import update
+from sqlalchemy.orm import joinedload
 from . import db
 import secrets
 from utils.timezone_helpers import get_ist_now
@@ -44,7 +46,8 @@ class PasswordResetToken(db.Model):
     @classmethod
     def validate_token(cls, token):
         """Validate a token and return the associated user if valid"""
-        reset_token = cls.query.filter_by(token=token, used=False).first()
+        # Load the user in the same query; the caller always needs it
+        reset_token = cls.query.options(joinedload(cls.user)).filter_by(token=token, used=False).first()
 
         if not reset_token:
             return None
@@ -66,6 +69,29 @@ class PasswordResetToken(db.Model):
 
         return reset_token.user
 
+    @classmethod
+    def consume_token(cls, token):
+        """
+        Atomically mark a valid token as used and return its user.
+        The caller commits, so the token and the password change land together.
+        """
+        current_time = get_ist_now()
+        if current_time.tzinfo is not None:
+            current_time = current_time.replace(tzinfo=None)
+
+        # Conditional UPDATE: only one request can flip used=False -> True
+        result = db.session.execute(
+            update(cls)
+            .where(cls.token == token, cls.used == False, cls.expires_at >= current_time)
+            .values(used=True)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            return None
+
+        reset_token = cls.query.options(joinedload(cls.user)).filter_by(token=token).first()
+        return reset_token.user if reset_token else None
+
     @classmethod
     def mark_token_used(cls, token):
         """Mark a token as used after successful password reset"""
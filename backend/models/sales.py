@@ -41,6 +41,9 @@ class SalesOrder(db.Model):
     created_at = db.Column(db.DateTime, default=get_ist_now)
     updated_at = db.Column(db.DateTime, default=get_ist_now, onupdate=get_ist_now)
     
+    # Order list filters by status and sorts newest first
+    __table_args__ = (db.Index('ix_sales_order_status_created', 'order_status', 'created_at'),)
+    
     # Relationship
     showroom_product = db.relationship('ShowroomProduct', backref='sales_orders')
     
@@ -112,6 +112,12 @@ class GatePass(db.Model):
     send_in_photo = db.Column(db.String(500), nullable=True)
     after_loading_photo = db.Column(db.String(500), nullable=True)
 
+    # Watchman lists filter by status and sort newest first
+    __table_args__ = (
+        db.Index('ix_gate_pass_status_issued', 'status', 'issued_at'),
+        db.Index('ix_gate_pass_issued_at', 'issued_at'),
+    )
+
     def to_dict(self):
         """Convert model instance to dictionary"""
         return {
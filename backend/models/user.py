@@ -1,10 +1,16 @@
 from werkzeug.security import generate_password_hash, check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
 from datetime import datetime, timedelta
 from enum import Enum
 import secrets
+from sqlalchemy.orm import validates
 from . import db
 from utils.timezone_helpers import get_ist_now
 
+# Argon2id (64 MiB, 3 passes); legacy Werkzeug PBKDF2 hashes are upgraded on login
+_password_hasher = PasswordHasher(time_cost=3, memory_cost=64 * 1024, parallelism=4)
+
 class UserStatus(Enum):
     PENDING = "pending"
     APPROVED = "approved"
@@ -18,18 +24,40 @@ class User(db.Model):
     email = db.Column(db.String(255), unique=True, nullable=False)
     username = db.Column(db.String(100), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
-    department = db.Column(db.String(100), nullable=False)  # Can be: admin, management, production, purchase, store, assembly, finance, showroom, sales, dispatch, watchman, transport, hr, reception
-    status = db.Column(db.Enum(UserStatus), default=UserStatus.PENDING, nullable=False)
+    department = db.Column(db.String(100), nullable=False, index=True)  # Can be: admin, management, production, purchase, store, assembly, finance, showroom, sales, dispatch, watchman, transport, hr, reception
+    status = db.Column(db.Enum(UserStatus), default=UserStatus.PENDING, nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=get_ist_now)
     updated_at = db.Column(db.DateTime, default=get_ist_now, onupdate=get_ist_now)
     
+    @staticmethod
+    def normalize_email(email):
+        """Canonical form used for storing and looking up emails"""
+        return email.strip().lower()
+    
+    @validates('email')
+    def _normalize_email(self, key, email):
+        """Store emails in canonical form"""
+        return self.normalize_email(email) if email else email
+    
     def set_password(self, password):
         """Set password hash"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = _password_hasher.hash(password)
     
     def check_password(self, password):
         """Check password against hash"""
-        return check_password_hash(self.password_hash, password)
+        if not self.password_hash.startswith('$argon2'):
+            # Legacy Werkzeug hash
+            return check_password_hash(self.password_hash, password)
+        try:
+            return _password_hasher.verify(self.password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    
+    def password_needs_rehash(self):
+        """Check if the stored hash is legacy or uses outdated Argon2 parameters"""
+        if not self.password_hash.startswith('$argon2'):
+            return True
+        return _password_hasher.check_needs_rehash(self.password_hash)
     
     def to_dict(self, include_sensitive=False):
         """Convert user object to dictionary"""
@@ -49,11 +77,36 @@ class User(db.Model):
             
         return user_dict
     
+    @classmethod
+    def list_dicts(cls, *criteria):
+        """Return users matching the criteria as to_dict()-shaped dicts (column projection, no ORM objects)"""
+        rows = db.session.execute(
+            db.select(
+                cls.id, cls.full_name, cls.email, cls.username, cls.department,
+                cls.status, cls.created_at, cls.updated_at,
+            ).where(*criteria)
+        ).all()
+        return [
+            {
+                'id': row.id,
+                'fullName': row.full_name,
+                'email': row.email,
+                'username': row.username,
+                'department': row.department,
+                'status': row.status.value,
+                'createdAt': row.created_at.isoformat() if row.created_at else None,
+                'updatedAt': row.updated_at.isoformat() if row.updated_at else None
+            }
+            for row in rows
+        ]
+    
     @staticmethod
     def create_admin_user():
         """Create default admin user if it doesn't exist"""
-        admin = User.query.filter_by(username='admin', department='admin').first()
-        if not admin:
+        admin_exists = db.session.query(
+            User.query.filter_by(username='admin', department='admin').exists()
+        ).scalar()
+        if not admin_exists:
             admin = User(
                 full_name='System Administrator',
                 email='admin@erp.com',
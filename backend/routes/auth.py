@@ -6,41 +6,58 @@ from flask import Blueprint, request, jsonify, current_app
 from flask_mail import Message
 from utils.jwt_helpers import create_access_token_safe
 from utils.timezone_helpers import get_ist_now
+from utils.validators import require_json_fields
+from utils.rate_limit import limiter, client_and_identity_key
+from utils.cache import cache, cache_ok_responses
 from models.user import User, UserStatus, db
 from models.password_reset_token import PasswordResetToken
 from models import AuditAction, AuditModule
+from sqlalchemy.exc import IntegrityError
 from services.audit_service import AuditService
-from werkzeug.security import check_password_hash, generate_password_hash
-import threading
-import mailersend
-from threading import Thread
+from html import escape
 import os 
-from utils.mail import send_mailersend_email
-from utils.mail import send_email_async
+from utils.mail import queue_email
 
 auth_bp = Blueprint('auth', __name__)
 
+# Default departments (including management)
+DEFAULT_DEPARTMENTS = frozenset({
+    'production', 'purchase', 'store', 'assembly', 'finance', 'showroom', 'sales',
+    'dispatch', 'transport', 'hr', 'watchman', 'management', 'admin',
+})
+
+# Password reset notification sent to the admin mailbox
+_RESET_EMAIL_TEXT = (
+    "User {user_name} ({email}) has requested a password reset.\n\n"
+    "Click this link to reset their password:\n{reset_url}"
+)
+_RESET_EMAIL_HTML = """
+            <p><b>User:</b> {user_name} ({email})</p>
+            <p>Requested a password reset.</p>
+            <p><a href="{reset_url}" style="color: blue; text-decoration: underline;">
+                Click here to reset their password
+            </a></p>
+            <p>If this wasn't expected, please ignore this message.</p>
+        """
+
+# Cache key for the department list; cleared by user writes that can change it
+DEPARTMENTS_CACHE_KEY = 'auth:departments'
+
+
+def _invalidate_departments_cache():
+    """Force the next get_departments() call to re-query"""
+    cache.delete(DEPARTMENTS_CACHE_KEY)
+
 @auth_bp.route('/auth/register', methods=['POST'])
+@require_json_fields('full_name', 'email', 'username', 'password', 'department',
+                     message='Missing required field: {field}')
 def register():
     """Register a new user with pending status"""
     try:
-        data = request.get_json() or {}
-
-        # Validate required fields
-        required_fields = ['full_name', 'email', 'username', 'password', 'department']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-
-        # Check if email already exists
-        if User.query.filter_by(email=data['email']).first():
-            return jsonify({'error': 'Email already registered'}), 409
+        data = request.get_json()
 
-        # Check if username already exists
-        if User.query.filter_by(username=data['username']).first():
-            return jsonify({'error': 'Username already taken'}), 409
-
-        # Create new user with pending status
+        # Create new user with pending status (unique constraints on
+        # email/username reject duplicates, see IntegrityError below)
         new_user = User(
             full_name=data['full_name'],
             email=data['email'],
@@ -51,7 +68,18 @@ def register():
         new_user.set_password(data['password'])
 
         db.session.add(new_user)
-        db.session.commit()
+        try:
+            db.session.commit()
+            _invalidate_departments_cache()
+        except IntegrityError as e:
+            db.session.rollback()
+            # MySQL: "Duplicate entry '...' for key 'users.email'"
+            duplicate_key = str(e.orig).rsplit('for key', 1)[-1]
+            if 'email' in duplicate_key:
+                return jsonify({'error': 'Email already registered'}), 409
+            if 'username' in duplicate_key:
+                return jsonify({'error': 'Username already taken'}), 409
+            raise
 
         # Log registration activity
         AuditService.log_auth_activity(
@@ -71,6 +99,8 @@ def register():
         return jsonify({'error': str(e)}), 500
 
 @auth_bp.route('/auth/login', methods=['POST'])
+@limiter.limit("5/minute", key_func=client_and_identity_key)
+@limiter.limit("100/hour")
 def login():
     """Authenticate a user using either username or email and return user data"""
     try:
@@ -84,7 +114,7 @@ def login():
         if 'username' in data:
             user = User.query.filter_by(username=data['username']).first()
         else:
-            user = User.query.filter_by(email=data['email']).first()
+            user = User.query.filter_by(email=User.normalize_email(data['email'])).first()
 
         # Check if user exists and password is correct
         if not user or not user.check_password(data['password']):
@@ -108,6 +138,11 @@ def login():
             )
             return jsonify({'error': 'Your account is pending approval', 'status': user.status.value}), 403
 
+        # Transparently upgrade legacy/outdated password hashes
+        if user.password_needs_rehash():
+            user.set_password(data['password'])
+            db.session.commit()
+
         # Generate JWT token
         access_token = create_access_token_safe(identity=str(user.id))
         
@@ -135,8 +170,7 @@ def get_pending_users():
     try:
         # TODO: Add admin authentication check
 
-        pending_users = User.query.filter_by(status=UserStatus.PENDING).all()
-        return jsonify([user.to_dict() for user in pending_users]), 200
+        return jsonify(User.list_dicts(User.status == UserStatus.PENDING)), 200
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -147,7 +181,7 @@ def approve_user(user_id):
     try:
         # TODO: Add admin authentication check
 
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
@@ -180,7 +214,7 @@ def reject_user(user_id):
     try:
         # TODO: Add admin authentication check
 
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
@@ -213,8 +247,7 @@ def get_all_users():
     try:
         # TODO: Add admin authentication check
 
-        users = User.query.all()
-        return jsonify([user.to_dict() for user in users]), 200
+        return jsonify(User.list_dicts()), 200
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -257,7 +290,7 @@ def update_user_department(user_id):
         if 'department' not in data:
             return jsonify({'error': 'Department is required'}), 400
 
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
@@ -265,6 +298,7 @@ def update_user_department(user_id):
         user.department = data['department']
         user.updated_at = get_ist_now()  # Update timestamp to track change
         db.session.commit()
+        _invalidate_departments_cache()
 
         # Log the department change
         print(f"[DEPARTMENT CHANGE] User {user.username} (ID: {user_id}) department changed from {old_department} to {data['department']}")
@@ -286,7 +320,7 @@ def delete_user(user_id):
     try:
         # TODO: Add admin authentication check
 
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
@@ -296,6 +330,7 @@ def delete_user(user_id):
 
         db.session.delete(user)
         db.session.commit()
+        _invalidate_departments_cache()
 
         return jsonify({
             'message': 'User deleted successfully'
@@ -306,6 +341,8 @@ def delete_user(user_id):
         return jsonify({'error': str(e)}), 500
 
 @auth_bp.route('/auth/forgot-password', methods=['POST'])
+@limiter.limit("5/minute", key_func=client_and_identity_key)
+@limiter.limit("100/hour")
 def forgot_password():
     """
     Handle forgot password requests and send reset link via MailerSend.
@@ -314,7 +351,7 @@ def forgot_password():
     """
     try:
         data = request.get_json() or {}
-        email = data.get('email')
+        email = User.normalize_email(data.get('email') or '')
 
         if not email:
             return jsonify({'error': 'Email is required'}), 400
@@ -338,25 +375,13 @@ def forgot_password():
         # ✅ Send to admin email only
         admin_email = "alankarengghelp@gmail.com"
 
-        text_content = (
-            f"User {user_name} ({email}) has requested a password reset.\n\n"
-            f"Click this link to reset their password:\n{reset_url}"
+        text_content = _RESET_EMAIL_TEXT.format(user_name=user_name, email=email, reset_url=reset_url)
+        html_content = _RESET_EMAIL_HTML.format(
+            user_name=escape(user_name), email=escape(email), reset_url=escape(reset_url)
         )
 
-        html_content = f"""
-            <p><b>User:</b> {user_name} ({email})</p>
-            <p>Requested a password reset.</p>
-            <p><a href="{reset_url}" style="color: blue; text-decoration: underline;">
-                Click here to reset their password
-            </a></p>
-            <p>If this wasn't expected, please ignore this message.</p>
-        """
-
-        # Send email asynchronously to admin
-        Thread(
-            target=send_email_async,
-            args=(current_app._get_current_object(), admin_email, subject, html_content, text_content)
-        ).start()
+        # Queue email to admin on the background mail pool
+        queue_email(current_app._get_current_object(), admin_email, subject, html_content, text_content)
 
         return jsonify({
             'message': 'A password reset link has been sent to the support email. The support team will assist you with your password reset.',
@@ -370,28 +395,24 @@ def forgot_password():
         return jsonify({'error': str(e)}), 500
         
 @auth_bp.route('/auth/reset-password', methods=['POST'])
+@limiter.limit("5/minute")
+@limiter.limit("100/hour")
+@require_json_fields('token', 'new_password', message='Missing required field: {field}')
 def reset_password():
     """Reset user password using token"""
     try:
-        data = request.get_json() or {}
+        data = request.get_json()
 
-        required_fields = ['token', 'new_password']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-
-        # Validate token and get user
-        user = PasswordResetToken.validate_token(data['token'])
+        # Consume the token and get user (atomic, so a token works only once)
+        user = PasswordResetToken.consume_token(data['token'])
         if not user:
+            db.session.rollback()
             return jsonify({'error': 'Invalid or expired reset token'}), 400
 
-        # Update password
+        # Update password; token consumption commits with it
         user.set_password(data['new_password'])
         db.session.commit()
 
-        # Mark token as used
-        PasswordResetToken.mark_token_used(data['token'])
-
         return jsonify({'message': 'Password reset successfully'}), 200
 
     except Exception as e:
@@ -399,18 +420,17 @@ def reset_password():
         return jsonify({'error': str(e)}), 500
 
 @auth_bp.route('/auth/departments', methods=['GET'])
+@cache.cached(timeout=60, key_prefix=DEPARTMENTS_CACHE_KEY, response_filter=cache_ok_responses)
 def get_departments():
     """Get all available departments"""
     try:
-        # Default departments (including management)
-        default_departments = ['production', 'purchase', 'store', 'assembly', 'finance', 'showroom', 'sales', 'dispatch', 'transport', 'hr', 'watchman', 'management', 'admin']
-
-        # Get unique departments from existing users
-        users = User.query.all()
-        user_departments = set(user.department for user in users if user.department)
+        # Get unique departments from existing users (DISTINCT in the database)
+        rows = db.session.query(User.department).filter(
+            User.department.isnot(None), User.department != ''
+        ).distinct().all()
 
         # Combine and sort
-        all_departments = sorted(list(set(default_departments + list(user_departments))))
+        all_departments = sorted(DEFAULT_DEPARTMENTS.union(row[0] for row in rows))
 
         return jsonify({'departments': all_departments}), 200
 
@@ -429,7 +449,7 @@ def validate_session():
         if not user_id or not current_department:
             return jsonify({'valid': False, 'reason': 'Missing parameters'}), 400
         
-        user = User.query.get(user_id)
+        user = db.session.get(User, user_id)
         if not user:
             return jsonify({'valid': False, 'reason': 'User not found'}), 404
         
@@ -5,8 +5,12 @@ from flask import Blueprint, request, jsonify, send_file
 from datetime import date, datetime
 from services.gate_entry_service_db import gate_entry_service_db
 from services.attendance_integration_service import AttendanceIntegrationService
-from utils.face_recognition_utils import recognize_face_from_database, is_face_recognition_available
-from models.gate_entry import GateUser
+from utils.face_recognition_utils import (
+    FaceRecognitionBusyError, recognize_face_from_database, is_face_recognition_available,
+)
+from models import db
+from models.gate_entry import GateUser, GateFaceRegistry
+from sqlalchemy import case, func
 import pandas as pd
 from io import BytesIO
 
@@ -313,20 +317,29 @@ def recognize_face():
         return jsonify({'success': False, 'message': 'Photo is required'}), 400
     
     try:
-        # Get all users with face encodings
-        users = GateUser.query.filter(GateUser.face_encoding.isnot(None)).all()
+        # Cheap version of the registered faces; encodings are only loaded when it changes.
+        # GateFaceRegistry.version only increases, on every encoding write or user delete
+        # (entry/exit updates do not touch it).
+        has_face = GateUser.face_encoding.isnot(None)
+        faces_version = tuple(db.session.query(
+            func.count(GateUser.id),
+            db.select(GateFaceRegistry.version).where(GateFaceRegistry.id == 1).scalar_subquery(),
+        ).filter(has_face).one())
         
-        if not users:
+        if not faces_version[0]:
             return jsonify({
                 'success': False,
                 'message': 'No registered faces in database. Please ask HR to register employees first.'
             }), 404
         
-        # Build dictionary of face encodings
-        known_faces = {user.id: user.face_encoding for user in users}
+        def load_known_faces():
+            # Only id + encoding columns (no full GateUser objects)
+            return dict(db.session.execute(
+                db.select(GateUser.id, GateUser.face_encoding).where(has_face)
+            ).all())
         
         # Recognize face
-        result = recognize_face_from_database(photo, known_faces)
+        result = recognize_face_from_database(photo, load_known_faces, faces_version=faces_version)
         
         if not result['success']:
             return jsonify(result), 400
@@ -390,6 +403,8 @@ def recognize_face():
                 'message': entry_result['message']
             }), 400
             
+    except FaceRecognitionBusyError as e:
+        return jsonify({'success': False, 'message': str(e)}), 503
     except Exception as e:
         return jsonify({
             'success': False,
@@ -403,9 +418,11 @@ def face_recognition_status():
     available = is_face_recognition_available()
     
     if available:
-        # Count users with face encodings
-        users_with_faces = GateUser.query.filter(GateUser.face_encoding.isnot(None)).count()
-        total_users = GateUser.query.count()
+        # Count all users and those with face encodings in one aggregate query
+        total_users, users_with_faces = db.session.query(
+            func.count(GateUser.id),
+            func.count(case((GateUser.face_encoding.isnot(None), 1))),
+        ).one()
         return jsonify({
             'success': True,
             'available': True,
@@ -7,9 +7,14 @@ from services.sales_service import SalesService
 from services.gst_verification_service import GSTVerificationService
 from services.audit_service import AuditService
 from models import AuditAction, AuditModule, User, SalesOrder
+from utils.validators import require_json_fields
 
 sales_bp = Blueprint('sales', __name__)
 
+# Required JSON fields for endpoints that validate inline
+_DELIVERY_TYPE_FIELDS = ('deliveryType', 'transportCost')
+_RENEGOTIATE_FIELDS = ('negotiatedAmount', 'customerNotes')
+
 
 @sales_bp.route('/showroom/available', methods=['GET'])
 def get_available_showroom_products():
@@ -80,17 +85,12 @@ def get_sales_order(order_id):
 
 
 @sales_bp.route('/orders', methods=['POST'])
+@require_json_fields('customerName', 'showroomProductId', 'unitPrice', 'salesPerson')  # paymentMethod no longer required at order creation
 def create_sales_order():
     """Create a new sales order"""
     try:
         data = request.get_json()
         
-        # Validate required fields (paymentMethod no longer required at order creation)
-        required_fields = ['customerName', 'showroomProductId', 'unitPrice', 'salesPerson']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'{field} is required'}), 400
-        
         order = SalesService.create_sales_order(data)
         
         # Get user name from request data (salesPerson field)
@@ -151,8 +151,7 @@ def change_delivery_type_after_payment(order_id):
         if not data:
             return jsonify({'error': 'Request body must contain JSON data'}), 400
         
-        required_fields = ['deliveryType', 'transportCost']
-        for field in required_fields:
+        for field in _DELIVERY_TYPE_FIELDS:
             if field not in data:
                 return jsonify({'error': f'{field} is required'}), 400
         
@@ -205,17 +204,12 @@ def change_delivery_type_after_payment(order_id):
 
 
 @sales_bp.route('/orders/<int:order_id>/payment', methods=['POST'])
+@require_json_fields('amount', 'paymentMethod')
 def process_payment(order_id):
     """Process payment for a sales order"""
     try:
         data = request.get_json()
         
-        # Validate required fields
-        required_fields = ['amount', 'paymentMethod']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'{field} is required'}), 400
-        
         transaction = SalesService.process_payment(order_id, data)
         
         # Get sales order to get sales person name
@@ -497,8 +491,7 @@ def renegotiate_transport_cost(approval_id):
             return jsonify({'error': 'Request body must contain JSON data'}), 400
         
         # Validate required fields
-        required_fields = ['negotiatedAmount', 'customerNotes']
-        for field in required_fields:
+        for field in _RENEGOTIATE_FIELDS:
             if field not in data:
                 return jsonify({'error': f'{field} is required'}), 400
         
@@ -617,17 +610,12 @@ def get_salesperson_dashboard():
 
 
 @sales_bp.route('/targets', methods=['POST'])
+@require_json_fields('salesPerson', 'year', 'month', 'targetAmount', 'assignedBy')
 def set_sales_target():
     """Set or update sales target for a salesperson (Admin only)"""
     try:
         data = request.get_json()
         
-        # Validate required fields
-        required_fields = ['salesPerson', 'year', 'month', 'targetAmount', 'assignedBy']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'{field} is required'}), 400
-        
         result = SalesService.set_sales_target(
             sales_person=data['salesPerson'],
             year=int(data['year']),
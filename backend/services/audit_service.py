@@ -8,7 +8,7 @@ from utils.jwt_helpers import get_jwt_identity_safe
 from models import AuditTrail, AuditAction, AuditModule, User
 from functools import wraps
 import uuid
-import json
+import orjson
 from sqlalchemy import event
 
 
@@ -163,7 +163,7 @@ class AuditService:
                 if isinstance(data, dict):
                     return data
                 try:
-                    return json.loads(json.dumps(data))
+                    return orjson.loads(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
                 except Exception:
                     return str(data)
 
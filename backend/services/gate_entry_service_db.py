@@ -2,7 +2,6 @@
 Gate Entry Service - Database Implementation
 Replaces Excel-based storage with MySQL database
 """
-import json
 import logging
 from datetime import datetime, date, timedelta
 from typing import Dict, List, Optional
@@ -11,7 +10,7 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from models import db
 from models.gate_entry import GateUser, GateEntryLog, GoingOutLog, GateEntrySession
-from utils.face_recognition_utils import generate_face_encoding, recognize_face_from_database, is_face_recognition_available
+from utils.face_recognition_utils import FaceRecognitionBusyError, generate_face_encoding, recognize_face_from_database, is_face_recognition_available, serialize_face_encodings, deserialize_face_encodings
 from services.attendance_integration_service import AttendanceIntegrationService
 
 # Configure logging
@@ -105,18 +104,16 @@ class GateEntryServiceDB:
                         
                         logger.info(f"Result: success={success}, message='{message}', faces_detected={face_count}")
                         
-                        if success and encoding_result.get('encoding'):
-                            # encoding_result['encoding'] is already a JSON string, so parse it first
-                            try:
-                                encoding_data = json.loads(encoding_result['encoding'])
-                                encodings.append(encoding_data)
-                                logger.info(f"✅ Successfully added encoding #{len(encodings)}")
-                                logger.info(f"Encoding data shape: {len(encoding_data)}x{len(encoding_data[0]) if encoding_data else 0}")
-                            except json.JSONDecodeError as je:
-                                logger.error(f"❌ Failed to parse JSON encoding for photo {idx + 1}: {je}")
-                                logger.error(f"Encoding string length: {len(encoding_result['encoding'])}")
+                        if success and encoding_result.get('encoding') is not None:
+                            # encoding_result['encoding'] is the 100x100 uint8 face crop
+                            encoding_data = encoding_result['encoding']
+                            encodings.append(encoding_data)
+                            logger.info(f"✅ Successfully added encoding #{len(encodings)}")
+                            logger.info(f"Encoding data shape: {encoding_data.shape[0]}x{encoding_data.shape[1]}")
                         else:
                             logger.warning(f"⚠️  Face encoding failed: {message}")
+                    except FaceRecognitionBusyError:
+                        raise  # fail the registration rather than save it without faces
                     except Exception as e:
                         logger.error(f"❌ Exception processing photo {idx + 1}: {e}", exc_info=True)
                 
@@ -128,8 +125,8 @@ class GateEntryServiceDB:
             else:
                 logger.warning(f"⚠️  No photos to process")
             
-            # Store all encodings as JSON array (proper encoding, not double-encoded)
-            face_encoding_stored = json.dumps(encodings) if encodings else None
+            # Store all encodings as a packed uint8 .npy blob
+            face_encoding_stored = serialize_face_encodings(encodings)
             logger.info(f"Final encoding storage: {len(encodings)} encodings -> {len(face_encoding_stored) if face_encoding_stored else 0} bytes")
             
             # Store first photo for reference
@@ -220,7 +217,11 @@ class GateEntryServiceDB:
             allowed_fields = ['name', 'photo', 'face_encoding', 'status']
             for field in allowed_fields:
                 if field in kwargs:
-                    setattr(user, field, kwargs[field])
+                    value = kwargs[field]
+                    if field == 'face_encoding' and value:
+                        # Accept JSON/list input and store it in the packed binary format
+                        value = serialize_face_encodings(deserialize_face_encodings(value))
+                    setattr(user, field, value)
             
             db.session.commit()
             
@@ -7,6 +7,10 @@ from models.guest_list import GuestList, GuestStatus
 from datetime import datetime, date, time
 from sqlalchemy import or_, and_
 
+class GuestNotFoundError(LookupError, ValueError):
+    """Raised when a guest entry ID does not exist"""
+
+
 class GuestListService:
     """Service class for guest list operations"""
     
@@ -92,7 +96,7 @@ class GuestListService:
         try:
             guest = GuestList.query.get(guest_id)
             if not guest:
-                raise ValueError(f"Guest entry with ID {guest_id} not found")
+                raise GuestNotFoundError(f"Guest entry with ID {guest_id} not found")
             return guest.to_dict()
         except ValueError:
             raise
@@ -115,7 +119,7 @@ class GuestListService:
         try:
             guest = GuestList.query.get(guest_id)
             if not guest:
-                raise ValueError(f"Guest entry with ID {guest_id} not found")
+                raise GuestNotFoundError(f"Guest entry with ID {guest_id} not found")
             
             if guest.status == 'checked_in':
                 raise ValueError("Guest is already checked in")
@@ -147,7 +151,7 @@ class GuestListService:
         try:
             guest = GuestList.query.get(guest_id)
             if not guest:
-                raise ValueError(f"Guest entry with ID {guest_id} not found")
+                raise GuestNotFoundError(f"Guest entry with ID {guest_id} not found")
             
             if guest.status != 'checked_in':
                 raise ValueError("Guest must be checked in before checking out")
@@ -172,7 +176,7 @@ class GuestListService:
         try:
             guest = GuestList.query.get(guest_id)
             if not guest:
-                raise ValueError(f"Guest entry with ID {guest_id} not found")
+                raise GuestNotFoundError(f"Guest entry with ID {guest_id} not found")
             
             # Update fields if provided
             if 'guestName' in data:
@@ -221,7 +225,7 @@ class GuestListService:
         try:
             guest = GuestList.query.get(guest_id)
             if not guest:
-                raise ValueError(f"Guest entry with ID {guest_id} not found")
+                raise GuestNotFoundError(f"Guest entry with ID {guest_id} not found")
             
             if guest.status == 'checked_out':
                 raise ValueError("Cannot cancel a visit that has already been completed")
@@ -244,7 +248,7 @@ class GuestListService:
         try:
             guest = GuestList.query.get(guest_id)
             if not guest:
-                raise ValueError(f"Guest entry with ID {guest_id} not found")
+                raise GuestNotFoundError(f"Guest entry with ID {guest_id} not found")
             
             db.session.delete(guest)
             db.session.commit()
@@ -227,13 +227,12 @@ class HRService:
         # If face_encoding is not provided, let gate_entry_service_db generate it from photo
         gateuser_result = gate_entry_service_db.register_user(name=name, phone=phone, photos=photos, face_encoding=face_encoding)
 
-        # After registration, update Employee's face_encoding and photo from GateUser if available
+        # After registration, update Employee's photo from GateUser if available
+        # (face encodings stay on the GateUser in packed binary form)
         from models.gate_entry import GateUser
         gate_user = GateUser.query.filter_by(phone=phone).first()
         if gate_user:
             # Only update if values exist
-            if gate_user.face_encoding:
-                employee.face_encoding = gate_user.face_encoding
             if gate_user.photo:
                 employee.photo = gate_user.photo
             db.session.commit()
@@ -2,10 +2,12 @@
 Notification Service Module
 Handles real-time notifications for various system events
 """
+from collections import defaultdict
 from datetime import datetime
 from utils.timezone_helpers import get_ist_now
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import json
+import threading
 
 class NotificationService:
     """Service class for managing notifications"""
@@ -13,6 +15,9 @@ class NotificationService:
     # In-memory storage for notifications (in production, use Redis or database)
     _notifications = []
     _max_notifications = 100  # Keep only last 100 notifications
+    # Secondary index: (type, vehicleId) -> notifications about that vehicle
+    _by_vehicle: Dict[Tuple[str, int], List[Dict]] = defaultdict(list)
+    _lock = threading.Lock()
     
     @classmethod
     def create_notification(cls, 
@@ -36,31 +41,58 @@ class NotificationService:
             'read': False
         }
         
-        # Add to notifications list
-        cls._notifications.append(notification)
-        
-        # Keep only the most recent notifications
-        if len(cls._notifications) > cls._max_notifications:
-            cls._notifications = cls._notifications[-cls._max_notifications:]
+        with cls._lock:
+            # Add to notifications list
+            cls._notifications.append(notification)
+            vehicle_key = cls._vehicle_key(notification)
+            if vehicle_key:
+                cls._by_vehicle[vehicle_key].append(notification)
+            
+            # Keep only the most recent notifications
+            if len(cls._notifications) > cls._max_notifications:
+                dropped = cls._notifications[:-cls._max_notifications]
+                cls._notifications = cls._notifications[-cls._max_notifications:]
+                for old_notification in dropped:
+                    cls._unindex_vehicle(old_notification)
         
         return notification
     
+    @staticmethod
+    def _vehicle_key(notification: Dict) -> Optional[Tuple[str, int]]:
+        """Index key for notifications that refer to a vehicle"""
+        vehicle_id = (notification.get('data') or {}).get('vehicleId')
+        try:
+            return (notification['type'], int(vehicle_id)) if vehicle_id else None
+        except (TypeError, ValueError):
+            return None
+    
+    @classmethod
+    def _unindex_vehicle(cls, notification: Dict) -> None:
+        """Remove a trimmed notification from the vehicle index (caller holds _lock)"""
+        vehicle_key = cls._vehicle_key(notification)
+        if not vehicle_key:
+            return
+        remaining = [n for n in cls._by_vehicle.get(vehicle_key, ()) if n is not notification]
+        if remaining:
+            cls._by_vehicle[vehicle_key] = remaining
+        else:
+            cls._by_vehicle.pop(vehicle_key, None)
+    
     @classmethod
     def get_notifications(cls, 
                          department: Optional[str] = None,
                          unread_only: bool = False,
-                         limit: int = 50) -> List[Dict]:
+                         limit: int = 50,
+                         notification_type: Optional[str] = None) -> List[Dict]:
         """Get notifications with optional filtering"""
         
-        notifications = cls._notifications.copy()
-        
-        # Filter by department
-        if department:
-            notifications = [n for n in notifications if n.get('department') == department]
-        
-        # Filter by read status
-        if unread_only:
-            notifications = [n for n in notifications if not n.get('read', False)]
+        # Apply all filters in one pass, before the limit
+        notifications = [
+            n for n in cls._notifications
+            if (not department or n.get('department') == department)
+            and (not unread_only or not n.get('read', False))
+            and (not notification_type or n.get('type') == notification_type)
+        ]
         
         # Sort by timestamp (newest first)
         notifications.sort(key=lambda x: x['timestamp'], reverse=True)
@@ -78,6 +110,18 @@ class NotificationService:
                 return True
         return False
     
+    @classmethod
+    def mark_read_by_vehicle(cls, vehicle_id: int, notification_type: str = 'company_vehicle_return') -> int:
+        """Mark unread notifications of a type for one vehicle as read; returns how many changed"""
+        
+        count = 0
+        with cls._lock:
+            for notification in cls._by_vehicle.get((notification_type, int(vehicle_id)), ()):
+                if not notification.get('read', False):
+                    notification['read'] = True
+                    count += 1
+        return count
+    
     @classmethod
     def mark_all_as_read(cls, department: Optional[str] = None) -> int:
         """Mark all notifications as read, optionally filtered by department"""
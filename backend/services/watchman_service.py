@@ -375,44 +375,36 @@ class WatchmanService:
     def search_gate_pass(search_term):
         """Search gate passes by customer name, order number, or vehicle number"""
         try:
-            gate_passes = GatePass.query.filter(
+            pattern = f'%{search_term}%'
+            # One query: match and fetch order number / product name via joins
+            rows = db.session.query(
+                GatePass, DispatchRequest.sales_order_id, SalesOrder.order_number, ShowroomProduct.name
+            ).join(
+                DispatchRequest, DispatchRequest.id == GatePass.dispatch_request_id
+            ).outerjoin(
+                SalesOrder, SalesOrder.id == DispatchRequest.sales_order_id
+            ).outerjoin(
+                ShowroomProduct, ShowroomProduct.id == DispatchRequest.showroom_product_id
+            ).filter(
                 db.or_(
-                    GatePass.party_name.ilike(f'%{search_term}%'),
-                    GatePass.vehicle_no.ilike(f'%{search_term}%')
+                    GatePass.party_name.ilike(pattern),
+                    GatePass.vehicle_no.ilike(pattern),
+                    SalesOrder.order_number.ilike(pattern)
                 )
             ).order_by(GatePass.issued_at.desc()).all()
             
             results = []
-            for gate_pass in gate_passes:
-                dispatch_request = DispatchRequest.query.get(gate_pass.dispatch_request_id)
-                if dispatch_request:
-                    sales_order = SalesOrder.query.get(dispatch_request.sales_order_id)
-                    showroom_product = ShowroomProduct.query.get(dispatch_request.showroom_product_id)
-                    
-                    # Also search by order number
-                    if sales_order and search_term.upper() in sales_order.order_number.upper():
-                        results.append({
-                            'gatePassId': gate_pass.id,
-                            'orderNumber': sales_order.order_number,
-                            'productName': showroom_product.name if showroom_product else 'Unknown Product',
-                            'customerName': gate_pass.party_name,
-                            'customerVehicle': gate_pass.vehicle_no,
-                            'status': gate_pass.status,
-                            'issuedAt': gate_pass.issued_at.isoformat(),
-                            'verifiedAt': gate_pass.verified_at.isoformat() if gate_pass.verified_at else None
-                        })
-                    elif search_term.lower() in gate_pass.party_name.lower() or \
-                         (gate_pass.vehicle_no and search_term.upper() in gate_pass.vehicle_no.upper()):
-                        results.append({
-                            'gatePassId': gate_pass.id,
-                            'orderNumber': sales_order.order_number if sales_order else f'SO-{dispatch_request.sales_order_id}',
-                            'productName': showroom_product.name if showroom_product else 'Unknown Product',
-                            'customerName': gate_pass.party_name,
-                            'customerVehicle': gate_pass.vehicle_no,
-                            'status': gate_pass.status,
-                            'issuedAt': gate_pass.issued_at.isoformat(),
-                            'verifiedAt': gate_pass.verified_at.isoformat() if gate_pass.verified_at else None
-                        })
+            for gate_pass, sales_order_id, order_number, product_name in rows:
+                results.append({
+                    'gatePassId': gate_pass.id,
+                    'orderNumber': order_number or f'SO-{sales_order_id}',
+                    'productName': product_name or 'Unknown Product',
+                    'customerName': gate_pass.party_name,
+                    'customerVehicle': gate_pass.vehicle_no,
+                    'status': gate_pass.status,
+                    'issuedAt': gate_pass.issued_at.isoformat(),
+                    'verifiedAt': gate_pass.verified_at.isoformat() if gate_pass.verified_at else None
+                })
             
             return results
         except Exception as e:
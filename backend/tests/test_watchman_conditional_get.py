@@ -0,0 +1,37 @@
+"""
+Conditional GET (ETag / 304) on polled watchman endpoints behind Flask-Compress
+"""
+import pytest
+
+from app import create_app
+from services.watchman_service import WatchmanService
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Large enough to pass COMPRESS_MIN_SIZE so the response is gzipped
+    summary = {f'metric_{i}': i for i in range(100)}
+    monkeypatch.setattr(WatchmanService, 'get_daily_summary', staticmethod(lambda: summary))
+    app = create_app('testing')
+    return app.test_client()
+
+
+def test_gzip_revalidation_returns_304(client):
+    headers = {'Accept-Encoding': 'gzip'}
+    first = client.get('/api/watchman/summary', headers=headers)
+    assert first.status_code == 200
+    assert first.headers['Content-Encoding'] == 'gzip'
+    etag = first.headers['ETag']
+    assert etag.endswith(':gzip"')
+
+    revalidated = client.get('/api/watchman/summary', headers={**headers, 'If-None-Match': etag})
+    assert revalidated.status_code == 304
+
+
+def test_identity_revalidation_returns_304(client):
+    first = client.get('/api/watchman/summary')
+    assert first.status_code == 200
+    assert 'Content-Encoding' not in first.headers
+
+    revalidated = client.get('/api/watchman/summary', headers={'If-None-Match': first.headers['ETag']})
+    assert revalidated.status_code == 304
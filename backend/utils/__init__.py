@@ -2,12 +2,13 @@
 Utility functions package initialization
 """
 
-from .validators import validate_required_fields, validate_email, validate_phone
+from .validators import validate_required_fields, require_json_fields, validate_email, validate_phone
 from .helpers import calculate_order_value, format_currency, get_status_color
 from .database import init_sample_data, backup_database
 
 __all__ = [
     'validate_required_fields',
+    'require_json_fields',
     'validate_email',
     'validate_phone',
     'calculate_order_value',
@@ -0,0 +1,12 @@
+"""
+Response cache for frequently polled dashboard endpoints (Flask-Caching)
+"""
+from flask_caching import Cache
+
+# Backend comes from CACHE_TYPE (Redis shares entries across workers)
+cache = Cache()
+
+
+def cache_ok_responses(rv):
+    """response_filter for @cache.cached: only keep successful responses"""
+    return not isinstance(rv, tuple) or rv[1] == 200
@@ -36,9 +36,7 @@ def init_sample_data():
                 }
             ]
             
-            for product_data in sample_products:
-                product = ShowroomProduct(**product_data)
-                db.session.add(product)
+            db.session.bulk_insert_mappings(ShowroomProduct, sample_products)
         
         # Sample inventory items
         if StoreInventory.query.count() == 0:
@@ -51,9 +49,7 @@ def init_sample_data():
                 {'name': 'Metal Brackets', 'quantity': 150, 'category': 'Component'}
             ]
             
-            for item_data in sample_inventory:
-                item = StoreInventory(**item_data)
-                db.session.add(item)
+            db.session.bulk_insert_mappings(StoreInventory, sample_inventory)
         
         db.session.commit()
         return True
@@ -2,15 +2,23 @@
 Face Recognition Utilities using face_recognition library
 Handles face encoding generation and comparison
 """
-import base64
+import hashlib
 import io
-import json
 import logging
+import os
+import threading
 import numpy as np
+import orjson
 from PIL import Image
 
 logger = logging.getLogger(__name__)
 
+# SIMD base64 decoder for camera-sized photo payloads; stdlib as fallback
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 
 # Try to import OpenCV
 try:
@@ -19,7 +27,7 @@ try:
     logger.info("OpenCV (cv2) library loaded successfully")
 except ImportError as e:
     FACE_RECOGNITION_AVAILABLE = False
-    logger.warning(f"OpenCV (cv2) library not available. Face recognition features will be disabled. Error: {e}")
+    logger.warning("OpenCV (cv2) library not available. Face recognition features will be disabled. Error: %s", e)
 
 
 def is_face_recognition_available():
@@ -27,8 +35,58 @@ def is_face_recognition_available():
     return FACE_RECOGNITION_AVAILABLE
 
 
-def base64_to_image(base64_string):
-    """Convert base64 string to PIL Image"""
+# Stored encodings are 100x100 grayscale face crops used to train LBPH
+FACE_ENCODING_SHAPE = (100, 100)
+
+# Longest image side used for face detection; larger photos are downscaled first
+FACE_DETECTION_MAX_SIDE = 640
+
+
+def serialize_face_encodings(encodings):
+    """
+    Pack face encodings into a compact .npy blob for database storage
+
+    Args:
+        encodings: List of 100x100 uint8 face images (nested lists or numpy arrays)
+
+    Returns:
+        bytes: .npy payload holding a (n, 100, 100) uint8 array, or None if empty
+    """
+    if encodings is None or len(encodings) == 0:
+        return None
+    stacked = np.asarray(encodings, dtype=np.uint8).reshape(-1, *FACE_ENCODING_SHAPE)
+    buffer = io.BytesIO()
+    np.save(buffer, stacked, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def deserialize_face_encodings(stored):
+    """
+    Load stored face encodings as a (n, 100, 100) uint8 numpy array
+
+    Accepts the .npy blob format as well as legacy JSON text holding
+    either a single encoding or a list of encodings.
+    """
+    if stored is None or len(stored) == 0:
+        return np.empty((0, *FACE_ENCODING_SHAPE), dtype=np.uint8)
+
+    if isinstance(stored, (bytes, bytearray, memoryview)):
+        stored = bytes(stored)
+        if stored.startswith(np.lib.format.MAGIC_PREFIX):
+            return np.load(io.BytesIO(stored), allow_pickle=False)
+
+    # Legacy JSON text (str, or bytes read back from the BLOB column)
+    data = orjson.loads(stored) if isinstance(stored, (str, bytes)) else stored
+    faces = np.asarray(data, dtype=np.uint8)
+    if faces.shape == FACE_ENCODING_SHAPE:
+        faces = faces[np.newaxis]
+    if faces.ndim != 3 or faces.shape[1:] != FACE_ENCODING_SHAPE:
+        raise ValueError(f"Invalid face encoding shape {faces.shape}")
+    return faces
+
+
+def base64_to_image(base64_string, mode='RGB'):
+    """Convert base64 string to PIL Image in the given mode ('L' for grayscale)"""
     try:
         # Remove data URL prefix if present
         if ',' in base64_string:
@@ -40,13 +98,13 @@ def base64_to_image(base64_string):
         # Convert to PIL Image
         image = Image.open(io.BytesIO(image_bytes))
         
-        # Convert to RGB if necessary
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
+        # Convert to the requested mode if necessary
+        if image.mode != mode:
+            image = image.convert(mode)
         
         return image
     except Exception as e:
-        logger.error(f"Error converting base64 to image: {e}")
+        logger.error("Error converting base64 to image: %s", e)
         return None
 
 
@@ -55,11 +113,29 @@ def image_to_numpy(image):
     try:
         return np.array(image)
     except Exception as e:
-        logger.error(f"Error converting image to numpy: {e}")
+        logger.error("Error converting image to numpy: %s", e)
         return None
 
 
-def generate_face_encoding(photo_base64):
+# One loaded face cascade per thread (parsing the XML model costs more than a
+# detection; CascadeClassifier instances are not safe to share across threads)
+_cascade_local = threading.local()
+
+
+def _get_face_cascade():
+    """Return this thread's frontal-face cascade, loading it on first use"""
+    face_cascade = getattr(_cascade_local, 'face_cascade', None)
+    if face_cascade is None:
+        # FACE_CASCADE_PATH can point at a faster LBP cascade
+        # (e.g. lbpcascade_frontalface_improved.xml, not bundled with the pip wheels)
+        cascade_path = os.getenv('FACE_CASCADE_PATH') or cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+        face_cascade = cv2.CascadeClassifier(cascade_path)
+        if not face_cascade.empty():
+            _cascade_local.face_cascade = face_cascade
+    return face_cascade
+
+
+def _generate_face_encoding(photo_base64):
     """
     Generate face encoding from base64 photo using OpenCV LBPH
 
@@ -69,7 +145,7 @@ def generate_face_encoding(photo_base64):
     Returns:
         dict: {
             'success': bool,
-            'encoding': str (JSON serialized numpy array) or None,
+            'encoding': 100x100 uint8 numpy array (face crop) or None,
             'message': str,
             'face_count': int
         }
@@ -93,11 +169,11 @@ def generate_face_encoding(photo_base64):
         }
 
     try:
-        logger.info("🔄 Starting face encoding generation process...")
+        logger.debug("🔄 Starting face encoding generation process...")
 
-        # Step 1: Convert base64 to image
-        logger.info("Step 1: Converting base64 to image...")
-        image = base64_to_image(photo_base64)
+        # Step 1: Convert base64 to image (decoded straight to grayscale; no RGB copy)
+        logger.debug("Step 1: Converting base64 to grayscale image...")
+        image = base64_to_image(photo_base64, mode='L')
         if image is None:
             logger.error("Failed to decode base64 image")
             return {
@@ -106,12 +182,12 @@ def generate_face_encoding(photo_base64):
                 'message': 'Failed to decode image from base64',
                 'face_count': 0
             }
-        logger.info(f"✅ Image decoded successfully: {image.size} pixels, mode: {image.mode}")
+        logger.debug("✅ Image decoded successfully: %s pixels, mode: %s", image.size, image.mode)
 
         # Step 2: Convert to numpy array
-        logger.info("Step 2: Converting to numpy array...")
-        image_array = image_to_numpy(image)
-        if image_array is None:
+        logger.debug("Step 2: Converting to numpy array...")
+        gray = image_to_numpy(image)
+        if gray is None:
             logger.error("Failed to convert image to numpy array")
             return {
                 'success': False,
@@ -119,16 +195,33 @@ def generate_face_encoding(photo_base64):
                 'message': 'Failed to convert image to array',
                 'face_count': 0
             }
-        logger.info(f"✅ Image converted to array: shape {image_array.shape}")
+        logger.debug("✅ Image converted to grayscale array: shape %s", gray.shape)
+
+        return _encode_from_ndarray(gray)
+
+    except Exception as e:
+        logger.error("Error generating face encoding: %s", e, exc_info=True)
+        return {
+            'success': False,
+            'encoding': None,
+            'message': f'Error processing face: {str(e)}',
+            'face_count': 0
+        }
 
-        # Step 3: Convert to grayscale
-        logger.info("Step 3: Converting to grayscale...")
-        gray = cv2.cvtColor(image_array, cv2.COLOR_RGB2GRAY)
-        logger.info(f"✅ Converted to grayscale: shape {gray.shape}")
 
-        # Step 4: Load Haar Cascade
-        logger.info("Step 4: Loading Haar Cascade classifier...")
-        face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+def _encode_from_ndarray(image_array):
+    """
+    Generate face encoding from an image array (grayscale, or RGB which is converted)
+
+    Detection/crop half of _generate_face_encoding, kept separate from the
+    base64 decoding steps; returns the same dict.
+    """
+    try:
+        gray = image_array if image_array.ndim == 2 else cv2.cvtColor(image_array, cv2.COLOR_RGB2GRAY)
+
+        # Step 3: Load Haar Cascade
+        logger.debug("Step 3: Loading Haar Cascade classifier...")
+        face_cascade = _get_face_cascade()
         if face_cascade.empty():
             logger.error("Failed to load Haar Cascade classifier")
             return {
@@ -137,10 +230,19 @@ def generate_face_encoding(photo_base64):
                 'message': 'Face detection classifier failed to load',
                 'face_count': 0
             }
-        logger.info("✅ Haar Cascade loaded successfully")
+        logger.debug("✅ Haar Cascade loaded successfully")
+
+        # Step 4: Detect faces with multiple parameter sets for better detection
+        logger.debug("Step 4: Detecting faces...")
 
-        # Step 5: Detect faces with multiple parameter sets for better detection
-        logger.info("Step 5: Detecting faces...")
+        # Detect on a downscaled copy (cost grows with pixels x pyramid levels);
+        # boxes are mapped back so the crop still comes from the full-res image
+        detect_scale = min(1.0, FACE_DETECTION_MAX_SIDE / max(gray.shape))
+        if detect_scale < 1.0:
+            detect_gray = cv2.resize(gray, None, fx=detect_scale, fy=detect_scale, interpolation=cv2.INTER_AREA)
+            logger.debug("  Detecting on downscaled image: %dx%d", detect_gray.shape[1], detect_gray.shape[0])
+        else:
+            detect_gray = gray
 
         # Try multiple detection parameters for better success rate
         detection_attempts = [
@@ -153,29 +255,31 @@ def generate_face_encoding(photo_base64):
         best_attempt = None
 
         for i, params in enumerate(detection_attempts):
-            logger.info(f"  Attempt {i+1}: scaleFactor={params['scaleFactor']}, minNeighbors={params['minNeighbors']}")
+            logger.debug("  Attempt %d: scaleFactor=%s, minNeighbors=%s", i + 1, params['scaleFactor'], params['minNeighbors'])
             detected_faces = face_cascade.detectMultiScale(
-                gray,
+                detect_gray,
                 scaleFactor=params['scaleFactor'],
                 minNeighbors=params['minNeighbors'],
                 minSize=params['minSize']
             )
-            logger.info(f"    Found {len(detected_faces)} faces")
+            logger.debug("    Found %d faces", len(detected_faces))
 
             if len(detected_faces) == 1:
                 # Perfect - exactly one face
                 faces = detected_faces
                 best_attempt = i + 1
-                logger.info(f"    ✅ Perfect: Exactly 1 face found with attempt {best_attempt}")
+                logger.debug("    ✅ Perfect: Exactly 1 face found with attempt %d", best_attempt)
                 break
             elif len(detected_faces) > 1 and faces is None:
                 # Multiple faces - use this if we don't find a single face later
                 faces = detected_faces
                 best_attempt = i + 1
-                logger.info(f"    ⚠️  Multiple faces ({len(detected_faces)}) found - will use largest if no single face found")
+                logger.debug("    ⚠️  Multiple faces (%d) found - will use largest if no single face found", len(detected_faces))
 
         face_count = len(faces) if faces is not None else 0
-        logger.info(f"Final detection result: {face_count} faces")
+        if face_count and detect_scale < 1.0:
+            faces = np.round(np.asarray(faces) / detect_scale).astype(int)
+        logger.debug("Final detection result: %d faces", face_count)
 
         if face_count == 0:
             logger.warning("No faces detected in the image")
@@ -186,19 +290,19 @@ def generate_face_encoding(photo_base64):
                 'face_count': 0
             }
 
-        # Step 6: Select the best face
-        logger.info("Step 6: Selecting best face...")
+        # Step 5: Select the best face
+        logger.debug("Step 5: Selecting best face...")
         if face_count == 1:
             selected_face = faces[0]
-            logger.info("✅ Using the single detected face")
+            logger.debug("✅ Using the single detected face")
         else:
             # Multiple faces - select the largest one (by area)
             face_areas = [(x, y, w, h, w * h) for (x, y, w, h) in faces]
             selected_face = max(face_areas, key=lambda f: f[4])[:4]  # Remove area from tuple
-            logger.info(f"⚠️  Multiple faces detected ({face_count}), using largest face: {selected_face}")
+            logger.debug("⚠️  Multiple faces detected (%d), using largest face: %s", face_count, selected_face)
 
-        # Step 7: Extract and process face
-        logger.info("Step 7: Extracting and processing face...")
+        # Step 6: Extract and process face
+        logger.debug("Step 6: Extracting and processing face...")
         (x, y, w, h) = selected_face
 
         # Add padding to face region (10% of face size)
@@ -212,28 +316,24 @@ def generate_face_encoding(photo_base64):
         y2 = min(gray.shape[0], y + h + padding_y)
 
         face_img = gray[y1:y2, x1:x2]
-        logger.info(f"✅ Face extracted: original size {w}x{h}, padded size {face_img.shape[1]}x{face_img.shape[0]}")
+        logger.debug("✅ Face extracted: original size %dx%d, padded size %dx%d", w, h, face_img.shape[1], face_img.shape[0])
 
-        # Step 8: Resize to standard size
-        logger.info("Step 8: Resizing to standard encoding size...")
+        # Step 7: Resize to standard size
+        logger.debug("Step 7: Resizing to standard encoding size...")
         face_img_resized = cv2.resize(face_img, (100, 100))
-        logger.info(f"✅ Face resized to 100x100 for encoding")
+        logger.debug("✅ Face resized to 100x100 for encoding")
 
-        # Step 9: Serialize encoding
-        logger.info("Step 9: Serializing face encoding...")
-        encoding_json = json.dumps(face_img_resized.tolist())
-        encoding_size = len(encoding_json)
-        logger.info(f"✅ Face encoding generated successfully: {encoding_size} bytes")
+        logger.info("✅ Face encoding generated: %s face(s) detected, %s bytes", face_count, face_img_resized.nbytes)
 
         return {
             'success': True,
-            'encoding': encoding_json,
+            'encoding': face_img_resized,
             'message': f'Face encoding generated successfully (detected {face_count} face(s), used {"single" if face_count == 1 else "largest"})',
             'face_count': face_count
         }
 
     except Exception as e:
-        logger.error(f"Error generating face encoding: {e}", exc_info=True)
+        logger.error("Error generating face encoding: %s", e, exc_info=True)
         return {
             'success': False,
             'encoding': None,
@@ -242,12 +342,42 @@ def generate_face_encoding(photo_base64):
         }
 
 
+class FaceRecognitionBusyError(RuntimeError):
+    """No face processing slot freed up within FACE_RECOGNITION_WAIT_SECONDS"""
+
+
+# Face detection is CPU-bound; cap concurrent runs per worker (default: this
+# worker's share of the CPUs, at least 2) so a burst of gate scans cannot
+# occupy every request thread, and give up instead of queueing indefinitely
+_FACE_WORK_CONCURRENCY = int(os.getenv(
+    'FACE_RECOGNITION_CONCURRENCY',
+    max(2, (os.cpu_count() or 1) // int(os.getenv('WEB_CONCURRENCY', 1))),
+))
+_FACE_WORK_WAIT_SECONDS = float(os.getenv('FACE_RECOGNITION_WAIT_SECONDS', 10))
+_face_work_slots = threading.BoundedSemaphore(_FACE_WORK_CONCURRENCY)
+
+
+def generate_face_encoding(photo_base64):
+    """
+    Generate face encoding from base64 photo (see _generate_face_encoding)
+
+    Waits up to FACE_RECOGNITION_WAIT_SECONDS for a processing slot, then
+    raises FaceRecognitionBusyError.
+    """
+    if not _face_work_slots.acquire(timeout=_FACE_WORK_WAIT_SECONDS):
+        raise FaceRecognitionBusyError('Face recognition is busy, please try again')
+    try:
+        return _generate_face_encoding(photo_base64)
+    finally:
+        _face_work_slots.release()
+
+
 def compare_faces(known_encoding_json, unknown_photo_base64, tolerance=0.6):
     """
     Compare a known face encoding with an unknown photo
     
     Args:
-        known_encoding_json: JSON string of known face encoding
+        known_encoding_json: Stored face encoding (.npy blob or legacy JSON)
         unknown_photo_base64: Base64 encoded photo to compare
         tolerance: Distance tolerance for matching (lower = more strict, default 0.6)
         
@@ -269,7 +399,7 @@ def compare_faces(known_encoding_json, unknown_photo_base64, tolerance=0.6):
     
     try:
         # Load known encoding (face image)
-        known_face_img = np.array(json.loads(known_encoding_json), dtype=np.uint8)
+        known_face_img = deserialize_face_encodings(known_encoding_json)[0]
         # Generate encoding for unknown photo
         result = generate_face_encoding(unknown_photo_base64)
         if not result['success']:
@@ -279,13 +409,13 @@ def compare_faces(known_encoding_json, unknown_photo_base64, tolerance=0.6):
                 'distance': None,
                 'message': result['message']
             }
-        unknown_face_img = np.array(json.loads(result['encoding']), dtype=np.uint8)
+        unknown_face_img = result['encoding']
         # Use LBPHFaceRecognizer for comparison
         recognizer = cv2.face.LBPHFaceRecognizer_create()
         recognizer.train([known_face_img], np.array([0]))
         label, confidence = recognizer.predict(unknown_face_img)
         match = confidence < (tolerance * 100)  # Lower confidence means better match
-        logger.info(f"Face comparison: match={match}, confidence={confidence:.2f}, tolerance={tolerance}")
+        logger.info("Face comparison: match=%s, confidence=%.2f, tolerance=%s", match, confidence, tolerance)
         return {
             'success': True,
             'match': match,
@@ -293,7 +423,7 @@ def compare_faces(known_encoding_json, unknown_photo_base64, tolerance=0.6):
             'message': 'Face matched!' if match else 'Face does not match'
         }
     except Exception as e:
-        logger.error(f"Error comparing faces: {e}")
+        logger.error("Error comparing faces: %s", e)
         return {
             'success': False,
             'match': False,
@@ -302,15 +432,106 @@ def compare_faces(known_encoding_json, unknown_photo_base64, tolerance=0.6):
         }
 
 
-def recognize_face_from_database(unknown_photo_base64, known_faces_dict, tolerance=0.7):
+# Trained recognizer reused across requests while the registered faces are unchanged
+_recognizer_cache = {'key': None, 'recognizer': None, 'labels': None}
+_recognizer_lock = threading.Lock()
+
+
+def _known_faces_key(known_faces_dict):
+    """Cheap fingerprint of the registered faces (user ids + digests of their stored blobs)"""
+    digest = hashlib.blake2b(digest_size=16)
+    for user_id in sorted(known_faces_dict):
+        stored = known_faces_dict[user_id]
+        if not stored:
+            continue
+        if isinstance(stored, str):
+            stored = stored.encode('utf-8')
+        digest.update(str(user_id).encode())
+        digest.update(hashlib.blake2b(stored, digest_size=16).digest())
+    return digest.digest()
+
+
+def _get_trained_recognizer(known_faces_dict, faces_version=None):
+    """
+    Return (recognizer, {label: user_id}) trained on every stored encoding
+
+    Training is skipped when the registered faces match the last trained
+    set; any register/update/delete changes the fingerprint and retrains.
+    With faces_version, that value is the fingerprint and known_faces_dict
+    may be a zero-argument loader, only called when retraining is needed.
+    Returns (None, {}) when there is nothing valid to train on.
+    """
+    if faces_version is not None:
+        key = ('version', faces_version)
+    else:
+        if callable(known_faces_dict):
+            known_faces_dict = known_faces_dict()
+        key = _known_faces_key(known_faces_dict)
+    with _recognizer_lock:
+        if _recognizer_cache['key'] == key:
+            logger.debug("✅ Reusing trained recognizer (registered faces unchanged)")
+            return _recognizer_cache['recognizer'], _recognizer_cache['labels']
+
+        if callable(known_faces_dict):
+            known_faces_dict = known_faces_dict()
+
+        # Prepare training data for LBPH recognizer
+        # IMPORTANT: Use ALL encodings from each user (not just the first one!)
+        train_imgs = []
+        train_labels = []
+        user_id_to_label = {}  # Map label to user_id
+        
+        for user_id, stored_encoding in known_faces_dict.items():
+            if not stored_encoding:
+                continue
+                
+            try:
+                # All encodings for the user (7 photos, or 1 for legacy single encodings)
+                user_faces = deserialize_face_encodings(stored_encoding)
+            except Exception as e:
+                logger.warning("   ❌ Failed to load encoding for user %s: %s", user_id, e)
+                continue
+            
+            if len(user_faces) == 0:
+                continue
+            
+            # Assign a unique label for this user and ADD ALL ENCODINGS for training
+            label = len(user_id_to_label)
+            user_id_to_label[label] = user_id
+            train_imgs.extend(user_faces)
+            train_labels.extend([label] * len(user_faces))
+            # Per-user detail: lazy %-formatting so large user tables pay nothing when DEBUG is off
+            logger.debug("📊 User %s: ✅ %d encoding(s) added", user_id, len(user_faces))
+        
+        logger.info("\n📈 Training data prepared:")
+        logger.info("   Total training images: %s", len(train_imgs))
+        logger.info("   Total users: %s", len(user_id_to_label))
+        
+        if not train_imgs:
+            return None, {}
+        
+        # Train LBPH recognizer with all encodings
+        logger.info("\n🔧 Training LBPH recognizer with %s images...", len(train_imgs))
+        recognizer = cv2.face.LBPHFaceRecognizer_create()
+        recognizer.train(train_imgs, np.array(train_labels))
+        logger.info("✅ Recognizer trained successfully")
+
+        _recognizer_cache.update(key=key, recognizer=recognizer, labels=user_id_to_label)
+        return recognizer, user_id_to_label
+
+
+def recognize_face_from_database(unknown_photo_base64, known_faces_dict, tolerance=0.7, faces_version=None):
     """
     Recognize a face from a database of known faces
     Properly handles multiple encodings per user (all 7 encodings used for training)
     
     Args:
         unknown_photo_base64: Base64 encoded photo to recognize
-        known_faces_dict: Dict of {user_id: face_encoding_json}
+        known_faces_dict: Dict of {user_id: stored face encodings (.npy blob or legacy JSON)},
+            or a zero-argument callable returning it (requires faces_version)
         tolerance: Distance tolerance for matching (lower = more strict, default 0.7 = 70% confidence threshold)
+        faces_version: Optional hashable that changes whenever registered faces change;
+            when the cached recognizer has this version the encodings are not loaded at all
         
     Returns:
         dict: {
@@ -340,10 +561,6 @@ def recognize_face_from_database(unknown_photo_base64, known_faces_dict, toleran
         }
     
     try:
-        logger.info("=" * 80)
-        logger.info("RECOGNIZE_FACE_FROM_DATABASE: Starting recognition")
-        logger.info("=" * 80)
-        
         result = generate_face_encoding(unknown_photo_base64)
         if not result['success']:
             return {
@@ -353,75 +570,12 @@ def recognize_face_from_database(unknown_photo_base64, known_faces_dict, toleran
                 'distance': None,
                 'message': result['message']
             }
-        unknown_face_img = np.array(json.loads(result['encoding']), dtype=np.uint8)
-        logger.info(f"Unknown face image shape: {unknown_face_img.shape}")
-        
-        # Prepare training data for LBPH recognizer
-        # IMPORTANT: Use ALL encodings from each user (not just the first one!)
-        train_imgs = []
-        train_labels = []
-        user_id_to_label = {}  # Map user_id to label
-        
-        for user_id, encoding_json in known_faces_dict.items():
-            if not encoding_json:
-                continue
-                
-            try:
-                # Parse the encoding - it could be single or multiple encodings
-                encoding_data = json.loads(encoding_json)
-                
-                logger.info(f"\n📊 Processing user {user_id}:")
-                logger.info(f"   Encoding data type: {type(encoding_data)}")
-                
-                # Check if this is multiple encodings (7 photos) or single encoding
-                if isinstance(encoding_data, list) and len(encoding_data) > 0:
-                    # Check if first item is also a list (indicating multiple encodings)
-                    if isinstance(encoding_data[0], list) and len(encoding_data[0]) > 0:
-                        if isinstance(encoding_data[0][0], list):
-                            # Multiple encodings: [[[...], [...]], [[...], [...]]]
-                            logger.info(f"   ✅ Multiple encodings detected: {len(encoding_data)} encodings")
-                            
-                            # Assign a unique label for this user
-                            label = len(user_id_to_label)
-                            user_id_to_label[label] = user_id
-                            
-                            # ADD ALL ENCODINGS for training (not just first one!)
-                            for encoding_idx, single_encoding in enumerate(encoding_data):
-                                try:
-                                    known_face_img = np.array(single_encoding, dtype=np.uint8)
-                                    if known_face_img.shape == (100, 100):
-                                        train_imgs.append(known_face_img)
-                                        train_labels.append(label)
-                                        logger.info(f"     Encoding {encoding_idx + 1}: ✅ Added (shape: {known_face_img.shape})")
-                                    else:
-                                        logger.warning(f"     Encoding {encoding_idx + 1}: ❌ Invalid shape {known_face_img.shape}")
-                                except Exception as e:
-                                    logger.warning(f"     Encoding {encoding_idx + 1}: ❌ Error: {e}")
-                        else:
-                            # Single encoding: [[...], [...]]
-                            logger.info(f"   ✅ Single encoding detected")
-                            label = len(user_id_to_label)
-                            user_id_to_label[label] = user_id
-                            known_face_img = np.array(encoding_data, dtype=np.uint8)
-                            if known_face_img.shape == (100, 100):
-                                train_imgs.append(known_face_img)
-                                train_labels.append(label)
-                                logger.info(f"     ✅ Added (shape: {known_face_img.shape})")
-                            else:
-                                logger.warning(f"     ❌ Invalid shape {known_face_img.shape}")
-                    else:
-                        logger.warning(f"   ❌ Invalid encoding structure for user {user_id}")
-                else:
-                    logger.warning(f"   ❌ Invalid encoding format for user {user_id}")
-                    
-            except Exception as e:
-                logger.warning(f"   ❌ Failed to load encoding for user {user_id}: {e}")
-        
-        logger.info(f"\n📈 Training data prepared:")
-        logger.info(f"   Total training images: {len(train_imgs)}")
-        logger.info(f"   Total users: {len(user_id_to_label)}")
+        unknown_face_img = result['encoding']
+        logger.debug("Unknown face image shape: %s", unknown_face_img.shape)
         
-        if not train_imgs:
+        # Trained LBPH recognizer over ALL encodings of every user (cached until they change)
+        recognizer, user_id_to_label = _get_trained_recognizer(known_faces_dict, faces_version)
+        if recognizer is None:
             return {
                 'success': False,
                 'recognized': False,
@@ -430,30 +584,17 @@ def recognize_face_from_database(unknown_photo_base64, known_faces_dict, toleran
                 'message': 'No valid face encodings in database'
             }
         
-        # Train LBPH recognizer with all encodings
-        logger.info(f"\n🔧 Training LBPH recognizer with {len(train_imgs)} images...")
-        recognizer = cv2.face.LBPHFaceRecognizer_create()
-        recognizer.train(train_imgs, np.array(train_labels))
-        logger.info("✅ Recognizer trained successfully")
-        
         # Predict
-        logger.info(f"\n🔍 Predicting face match...")
         label, confidence = recognizer.predict(unknown_face_img)
-        logger.info(f"   Predicted label: {label}, confidence: {confidence:.2f}")
-        logger.info(f"   Tolerance threshold: {tolerance * 100:.2f}")
+        logger.debug("Predicted label: %s, confidence: %.2f, threshold: %.2f", label, confidence, tolerance * 100)
         
         # Check if prediction is valid
         # LBPH confidence: lower is better, so lower threshold = stricter matching
         confidence_threshold = tolerance * 100
         match = confidence < confidence_threshold
-        logger.info(f"   Match result: {match} (confidence {confidence:.2f} < threshold {confidence_threshold:.2f})")
         best_match_user_id = user_id_to_label.get(label) if match else None
         
-        logger.info(f"\n✨ Recognition result:")
-        logger.info(f"   Match: {match}")
-        logger.info(f"   User ID: {best_match_user_id}")
-        logger.info(f"   Confidence: {confidence:.2f}")
-        logger.info("=" * 80)
+        logger.info("Face recognition: match=%s, user_id=%s, confidence=%.2f (threshold %.2f)", match, best_match_user_id, confidence, confidence_threshold)
         
         return {
             'success': True,
@@ -462,8 +603,10 @@ def recognize_face_from_database(unknown_photo_base64, known_faces_dict, toleran
             'distance': confidence,
             'message': f'Face recognized (confidence: {100-confidence:.1f}%)' if match else 'Face not recognized. Please try again or use manual entry.'
         }
+    except FaceRecognitionBusyError:
+        raise
     except Exception as e:
-        logger.error(f"Error recognizing face: {e}", exc_info=True)
+        logger.error("Error recognizing face: %s", e, exc_info=True)
         return {
             'success': False,
             'recognized': False,
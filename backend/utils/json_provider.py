@@ -0,0 +1,46 @@
+"""
+orjson-backed JSON provider for Flask responses
+"""
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+# datetime/date keep Flask's HTTP-date format so API output is unchanged;
+# numpy scalars/arrays (face recognition scores) serialize natively
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serialize with orjson, falling back to Flask's defaults for other types"""
+
+    def _default(self, o):
+        # orjson rejects float subclasses that the stdlib encoder accepts
+        if isinstance(o, float):
+            return float(o)
+        return self.default(o)
+
+    def _options(self):
+        return _ORJSON_OPTIONS | orjson.OPT_SORT_KEYS if self.sort_keys else _ORJSON_OPTIONS
+
+    def dumps(self, obj, **kwargs):
+        kwargs.pop("separators", None)  # orjson output is always compact
+        option = self._options()
+        # Debug pretty-printing: orjson only indents by 2, which is what Flask asks for
+        if kwargs.pop("indent", None):
+            option |= orjson.OPT_INDENT_2
+        # Other stdlib-only options still need the stdlib encoder
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self._default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """jsonify(): hand orjson's bytes straight to the response (no str round trip)"""
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self._default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
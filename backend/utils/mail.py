@@ -1,7 +1,114 @@
+import logging
 import os
-from threading import Thread
+import threading
+import time
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from flask import current_app
-from mailersend import emails
+
+logger = logging.getLogger(__name__)
+
+MAILERSEND_EMAIL_URL = 'https://api.mailersend.com/v1/email'
+MAILERSEND_TIMEOUT = 15  # seconds; a hung request would otherwise pin a mail worker
+MAIL_WORKERS = int(os.environ.get('MAIL_WORKERS', 2))
+# Background sends per minute from each worker process (0 disables the limit)
+MAIL_RATE_PER_MINUTE = int(os.environ.get('MAIL_RATE_PER_MINUTE', 60))
+
+
+class _TokenBucket:
+    """Blocking token bucket allowing `rate` acquisitions per `per` seconds (with bursts up to `rate`)"""
+
+    def __init__(self, rate, per):
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.fill_rate = rate / per
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.fill_rate
+            time.sleep(wait)
+
+
+_send_rate = _TokenBucket(MAIL_RATE_PER_MINUTE, 60) if MAIL_RATE_PER_MINUTE > 0 else None
+
+
+class _CircuitBreaker:
+    """Fail fast after `fail_max` consecutive failures; let one trial call through every `reset_timeout` seconds"""
+
+    def __init__(self, fail_max, reset_timeout):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Half-open: this call is the trial; others keep failing fast until it reports
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record(self, success):
+        with self.lock:
+            if success:
+                self.failures = 0
+                self.opened_at = None
+            else:
+                self.failures += 1
+                if self.failures >= self.fail_max:
+                    self.opened_at = time.monotonic()
+
+
+# Stops sends from waiting out timeouts one after another while MailerSend is down
+_mailersend_breaker = _CircuitBreaker(fail_max=5, reset_timeout=30)
+
+
+@lru_cache(maxsize=1)
+def _get_session():
+    """Return the MailerSend HTTP session, built once from MAILERSEND_API_KEY (lazily, after .env is loaded)"""
+    api_key = os.environ.get('MAILERSEND_API_KEY')
+    if not api_key:
+        # Not cached: raising lets a later send pick the key up once it is set
+        raise ValueError("MAILERSEND_API_KEY not set in environment variables.")
+    session = requests.Session()
+    session.headers.update({
+        'Authorization': f'Bearer {api_key}',
+        'Content-Type': 'application/json',
+        'X-Requested-With': 'XMLHttpRequest',
+    })
+    # Keep-alive pool sized for the mail workers; POSTs are only retried on
+    # connection failures (urllib3 never retries non-idempotent reads)
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=MAIL_WORKERS,
+        max_retries=Retry(total=3, backoff_factor=0.2),
+    )
+    session.mount('https://', adapter)
+    return session
+
+
+def _html_to_text(html_content):
+    """Plain-text fallback for an HTML body"""
+    return BeautifulSoup(html_content, 'html.parser').get_text(' ', strip=True)
+
 
 # --------------------------------------------------------------------
 # 1️⃣ FUNCTION: Send email using MailerSend
@@ -10,17 +117,12 @@ def send_mailersend_email(from_email, to_email, subject, html_content, text_cont
     """
     Send an email using MailerSend API.
     """
-    try:
-        api_key = os.environ.get('MAILERSEND_API_KEY')
-        print(f"🔍 DEBUG: API Key exists: {bool(api_key)}")
-        if api_key:
-            print(f"🔍 DEBUG: API Key starts with: {api_key[:15]}...")
-            print(f"🔍 DEBUG: API Key length: {len(api_key)}")
-        
-        if not api_key:
-            raise ValueError("MAILERSEND_API_KEY not set in environment variables.")
+    if not _mailersend_breaker.allow():
+        logger.warning("MailerSend unavailable (circuit open); not sending email to %s", to_email)
+        return False
 
-        mailer = emails.NewEmail(api_key)
+    try:
+        session = _get_session()
 
         # Ensure 'to_email' is always a list
         if isinstance(to_email, str):
@@ -32,15 +134,23 @@ def send_mailersend_email(from_email, to_email, subject, html_content, text_cont
             "to": [{"email": addr} for addr in to_email],
             "subject": subject,
             "html": html_content,
-            "text": text_content or html_content,
+            "text": text_content or _html_to_text(html_content),
         }
 
-        response = mailer.send(mail_body)
-        print(f"✅ Email sent successfully to {to_email}, response: {response}")
+        # Same request the mailersend SDK makes, but over a pooled connection
+        try:
+            response = session.post(MAILERSEND_EMAIL_URL, data=orjson.dumps(mail_body), timeout=MAILERSEND_TIMEOUT)
+        except requests.RequestException:
+            _mailersend_breaker.record(False)
+            raise
+        # Only outages (network errors, 5xx) trip the breaker, not rejected messages
+        _mailersend_breaker.record(response.status_code < 500)
+        response.raise_for_status()
+        logger.info("✅ Email sent successfully to %s, response: %s", to_email, response.status_code)
         return True
 
     except Exception as e:
-        print(f"❌ Failed to send MailerSend email: {e}")
+        logger.error("❌ Failed to send MailerSend email: %s", e)
         return False
 
 
@@ -50,8 +160,11 @@ def send_mailersend_email(from_email, to_email, subject, html_content, text_cont
 def send_email_async(app, to_email, subject, html_content, text_content=None):
     """
     Runs the MailerSend email sending in a background thread
-    with Flask app context.
+    with Flask app context, throttled to MAIL_RATE_PER_MINUTE.
     """
+    if _send_rate is not None:
+        # Only mail pool threads wait here; callers have already returned
+        _send_rate.acquire()
     with app.app_context():
         send_mailersend_email(
             current_app.config.get('MAILERSEND_FROM_EMAIL'),
@@ -60,3 +173,21 @@ def send_email_async(app, to_email, subject, html_content, text_content=None):
             html_content,
             text_content
         )
+
+
+# --------------------------------------------------------------------
+# 3️⃣ FUNCTION: Queue email on a shared background worker pool
+# --------------------------------------------------------------------
+# Threads start lazily on first submit, so each Gunicorn worker gets its own
+# pool after fork. Requires gthread (or similar) workers, not the sync worker.
+_mail_pool = ThreadPoolExecutor(
+    max_workers=MAIL_WORKERS,
+    thread_name_prefix='mail'
+)
+
+
+def queue_email(app, to_email, subject, html_content, text_content=None):
+    """
+    Queue an email for background delivery and return immediately.
+    """
+    return _mail_pool.submit(send_email_async, app, to_email, subject, html_content, text_content)
@@ -2,14 +2,53 @@
 Centralized Migration Manager
 Automatically runs all database migrations when the application starts
 """
+import logging
 import os
 import sys
+import time
 from sqlalchemy import create_engine, text
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Schema probes, built once and reused with bound parameters
+_COLUMN_EXISTS = text(
+    """
+    SELECT COUNT(*) AS cnt
+    FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = :table
+      AND COLUMN_NAME = :col
+    """
+)
+_TABLE_EXISTS = text(
+    """
+    SELECT COUNT(*) AS cnt
+    FROM information_schema.TABLES
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = :table
+    """
+)
+_TABLE_INDEXES = text(
+    """
+    SELECT DISTINCT INDEX_NAME
+    FROM information_schema.STATISTICS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = :table
+    """
+)
+_TABLE_COLUMNS = text(
+    """
+    SELECT COLUMN_NAME
+    FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND TABLE_NAME = :table
+    """
+)
+
 
 class MigrationManager:
     """Manages all database migrations for the ERP system"""
@@ -25,6 +64,7 @@ class MigrationManager:
         self.app = app
         self.db = db
         self.engine = None
+        self.applied = set()  # Names recorded in _migrations_applied
         
         if app:
             self.init_app(app, db)
@@ -41,34 +81,124 @@ class MigrationManager:
     
     def column_exists(self, connection, table_name: str, column_name: str) -> bool:
         """Check if a column exists in a table"""
-        query = text(
-            """
-            SELECT COUNT(*) AS cnt
-            FROM information_schema.COLUMNS
-            WHERE TABLE_SCHEMA = DATABASE()
-              AND TABLE_NAME = :table
-              AND COLUMN_NAME = :col
-            """
-        )
-        res = connection.execute(query, {"table": table_name, "col": column_name}).scalar()
+        res = connection.execute(_COLUMN_EXISTS, {"table": table_name, "col": column_name}).scalar()
         return int(res or 0) > 0
     
     def table_exists(self, connection, table_name: str) -> bool:
         """Check if a table exists"""
-        query = text(
-            """
-            SELECT COUNT(*) AS cnt
-            FROM information_schema.TABLES
-            WHERE TABLE_SCHEMA = DATABASE()
-              AND TABLE_NAME = :table
-            """
-        )
-        res = connection.execute(query, {"table": table_name}).scalar()
+        res = connection.execute(_TABLE_EXISTS, {"table": table_name}).scalar()
         return int(res or 0) > 0
     
+    def get_columns(self, connection, table_name: str) -> set:
+        """Get the names of all columns in a table with a single query"""
+        return {row[0] for row in connection.execute(_TABLE_COLUMNS, {"table": table_name})}
+    
+    def get_indexes(self, connection, table_name: str) -> set:
+        """Get the names of all indexes on a table with a single query"""
+        return {row[0] for row in connection.execute(_TABLE_INDEXES, {"table": table_name})}
+    
+    def load_applied_migrations(self, connection):
+        """Create the _migrations_applied marker table and load recorded names"""
+        connection.execute(text("""
+            CREATE TABLE IF NOT EXISTS _migrations_applied (
+                name VARCHAR(128) PRIMARY KEY,
+                applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """))
+        connection.commit()
+        self.applied = {row[0] for row in connection.execute(text("SELECT name FROM _migrations_applied"))}
+    
+    def mark_applied(self, connection, name: str):
+        """Record a migration step so later boots skip its schema probe (caller commits)"""
+        connection.execute(
+            text("""
+                INSERT INTO _migrations_applied (name, applied_at) VALUES (:name, NOW())
+                ON DUPLICATE KEY UPDATE applied_at = NOW()
+            """),
+            {"name": name}
+        )
+        self.applied.add(name)
+    
+    def add_missing_columns(self, connection, table_name: str, columns_to_add) -> list:
+        """
+        Add any missing columns to a table with a single ALTER TABLE statement
+
+        Columns recorded in _migrations_applied are skipped without probing
+        INFORMATION_SCHEMA.
+
+        Args:
+            connection: Database connection
+            table_name: Table to alter
+            columns_to_add: List of (column_name, column_type) tuples
+
+        Returns:
+            list: Names of the columns that were added
+        """
+        pending = [
+            (column_name, column_type) for column_name, column_type in columns_to_add
+            if f"{table_name}.{column_name}" not in self.applied
+        ]
+        existing_columns = self.get_columns(connection, table_name) if pending else set()
+
+        missing = []
+        for column_name, column_type in pending:
+            marker = f"{table_name}.{column_name}"
+            if column_name in existing_columns:
+                logger.info("✅ %s column already exists!", column_name)
+                self.mark_applied(connection, marker)
+            else:
+                missing.append((column_name, column_type))
+
+        if missing:
+            logger.info("   Adding %s column(s) to %s table...", ', '.join(name for name, _ in missing), table_name)
+            clauses = ", ".join(f"ADD COLUMN {name} {col_type}" for name, col_type in missing)
+            connection.execute(text(f"ALTER TABLE {table_name} {clauses}"))
+            for column_name, _ in missing:
+                self.mark_applied(connection, f"{table_name}.{column_name}")
+            logger.info("✅ %s column(s) added to %s successfully!", len(missing), table_name)
+        connection.commit()
+
+        return [name for name, _ in missing]
+    
+    def add_missing_indexes(self, connection, table_name: str, indexes_to_add) -> list:
+        """
+        Add any missing indexes to a table with a single ALTER TABLE statement
+
+        Args:
+            connection: Database connection
+            table_name: Table to alter
+            indexes_to_add: List of (index_name, column_list_sql) tuples
+
+        Returns:
+            list: Names of the indexes that were added
+        """
+        pending = [
+            (index_name, columns) for index_name, columns in indexes_to_add
+            if f"{table_name}:{index_name}" not in self.applied
+        ]
+        existing_indexes = self.get_indexes(connection, table_name) if pending else set()
+
+        missing = []
+        for index_name, columns in pending:
+            if index_name in existing_indexes:
+                self.mark_applied(connection, f"{table_name}:{index_name}")
+            else:
+                missing.append((index_name, columns))
+
+        if missing:
+            logger.info("   Adding %s index(es) to %s table...", ', '.join(name for name, _ in missing), table_name)
+            clauses = ", ".join(f"ADD INDEX {name} ({columns})" for name, columns in missing)
+            connection.execute(text(f"ALTER TABLE {table_name} {clauses}"))
+            for index_name, _ in missing:
+                self.mark_applied(connection, f"{table_name}:{index_name}")
+            logger.info("✅ %s index(es) added to %s successfully!", len(missing), table_name)
+        connection.commit()
+
+        return [name for name, _ in missing]
+    
     def run_sales_migration(self, connection):
         """Create sales tables"""
-        print("🔄 Running sales migration...")
+        logger.info("🔄 Running sales migration...")
         
         create_sales_order_table = """
         CREATE TABLE IF NOT EXISTS sales_order (
@@ -148,25 +278,13 @@ class MigrationManager:
             connection.commit()
             
             # Add additional columns if they don't exist
-            if not self.column_exists(connection, 'sales_order', 'coupon_code'):
-                connection.execute(text("ALTER TABLE sales_order ADD COLUMN coupon_code VARCHAR(50) NULL"))
-                connection.commit()
-            
-            if not self.column_exists(connection, 'sales_order', 'finance_bypass'):
-                connection.execute(text("ALTER TABLE sales_order ADD COLUMN finance_bypass BOOLEAN DEFAULT FALSE"))
-                connection.commit()
-            
-            if not self.column_exists(connection, 'sales_order', 'bypass_reason'):
-                connection.execute(text("ALTER TABLE sales_order ADD COLUMN bypass_reason TEXT NULL"))
-                connection.commit()
-            
-            if not self.column_exists(connection, 'sales_order', 'bypassed_at'):
-                connection.execute(text("ALTER TABLE sales_order ADD COLUMN bypassed_at DATETIME NULL"))
-                connection.commit()
-            
-            if not self.column_exists(connection, 'sales_order', 'payment_due_date'):
-                connection.execute(text("ALTER TABLE sales_order ADD COLUMN payment_due_date DATE NULL"))
-                connection.commit()
+            self.add_missing_columns(connection, 'sales_order', [
+                ("coupon_code", "VARCHAR(50) NULL"),
+                ("finance_bypass", "BOOLEAN DEFAULT FALSE"),
+                ("bypass_reason", "TEXT NULL"),
+                ("bypassed_at", "DATETIME NULL"),
+                ("payment_due_date", "DATE NULL"),
+            ])
             
             connection.execute(text(create_customer_table))
             connection.commit()
@@ -177,15 +295,15 @@ class MigrationManager:
             connection.execute(text(create_sales_target_table_sql))
             connection.commit()
             
-            print("✅ Sales tables created successfully!")
+            logger.info("✅ Sales tables created successfully!")
             return True
         except Exception as e:
-            print(f"⚠️ Sales migration error: {e}")
+            logger.warning("⚠️ Sales migration error: %s", e)
             return False
     
     def run_hr_migration(self, connection):
         """Create HR tables"""
-        print("🔄 Running HR migration...")
+        logger.info("🔄 Running HR migration...")
         
         create_employees_table = """
         CREATE TABLE IF NOT EXISTS employees (
@@ -387,15 +505,15 @@ class MigrationManager:
             connection.execute(text(create_candidates_table))
             connection.commit()
             
-            print("✅ HR tables created successfully!")
+            logger.info("✅ HR tables created successfully!")
             return True
         except Exception as e:
-            print(f"⚠️ HR migration error: {e}")
+            logger.warning("⚠️ HR migration error: %s", e)
             return False
     
     def run_tour_intimation_migration(self, connection):
         """Create tour intimations table"""
-        print("🔄 Running tour intimation migration...")
+        logger.info("🔄 Running tour intimation migration...")
         
         create_tour_intimations_table = """
         CREATE TABLE IF NOT EXISTS tour_intimations (
@@ -432,63 +550,48 @@ class MigrationManager:
             if not self.table_exists(connection, 'tour_intimations'):
                 connection.execute(text(create_tour_intimations_table))
                 connection.commit()
-                print("✅ Tour intimations table created successfully!")
+                logger.info("✅ Tour intimations table created successfully!")
             else:
-                print("✅ Tour intimations table already exists!")
+                logger.info("✅ Tour intimations table already exists!")
             
             return True
         except Exception as e:
-            print(f"⚠️ Tour intimation migration error: {e}")
+            logger.warning("⚠️ Tour intimation migration error: %s", e)
             return False
     
     def run_dispatch_migration(self, connection):
         """Update dispatch tables"""
-        print("🔄 Running dispatch migration...")
+        logger.info("🔄 Running dispatch migration...")
         
         try:
             # Add columns if they don't exist
             if self.table_exists(connection, 'dispatch_request'):
-                if not self.column_exists(connection, 'dispatch_request', 'sales_order_id'):
-                    connection.execute(text("ALTER TABLE dispatch_request ADD COLUMN sales_order_id INT"))
-                    connection.commit()
-                
-                if not self.column_exists(connection, 'dispatch_request', 'party_email'):
-                    connection.execute(text("ALTER TABLE dispatch_request ADD COLUMN party_email VARCHAR(200)"))
-                    connection.commit()
-                
-                if not self.column_exists(connection, 'dispatch_request', 'quantity'):
-                    connection.execute(text("ALTER TABLE dispatch_request ADD COLUMN quantity INT DEFAULT 1"))
-                    connection.commit()
-                
-                if not self.column_exists(connection, 'dispatch_request', 'dispatch_notes'):
-                    connection.execute(text("ALTER TABLE dispatch_request ADD COLUMN dispatch_notes TEXT"))
-                    connection.commit()
-                
-                if not self.column_exists(connection, 'dispatch_request', 'updated_at'):
-                    connection.execute(text("ALTER TABLE dispatch_request ADD COLUMN updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"))
-                    connection.commit()
+                self.add_missing_columns(connection, 'dispatch_request', [
+                    ("sales_order_id", "INT"),
+                    ("party_email", "VARCHAR(200)"),
+                    ("quantity", "INT DEFAULT 1"),
+                    ("dispatch_notes", "TEXT"),
+                    ("updated_at", "DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP"),
+                ])
 
                 # Add photo columns to gate_pass table for watchman capture
-                if not self.column_exists(connection, 'gate_pass', 'send_in_photo'):
-                    connection.execute(text("ALTER TABLE gate_pass ADD COLUMN send_in_photo VARCHAR(500) NULL"))
-                    connection.commit()
-
-                if not self.column_exists(connection, 'gate_pass', 'after_loading_photo'):
-                    connection.execute(text("ALTER TABLE gate_pass ADD COLUMN after_loading_photo VARCHAR(500) NULL"))
-                    connection.commit()
+                self.add_missing_columns(connection, 'gate_pass', [
+                    ("send_in_photo", "VARCHAR(500) NULL"),
+                    ("after_loading_photo", "VARCHAR(500) NULL"),
+                ])
                 
-                print("✅ Dispatch tables updated successfully!")
+                logger.info("✅ Dispatch tables updated successfully!")
             else:
-                print("ℹ️ dispatch_request table doesn't exist yet, skipping dispatch migration")
+                logger.info("ℹ️ dispatch_request table doesn't exist yet, skipping dispatch migration")
             
             return True
         except Exception as e:
-            print(f"⚠️ Dispatch migration error: {e}")
+            logger.warning("⚠️ Dispatch migration error: %s", e)
             return False
     
     def run_fleet_migration(self, connection):
         """Create fleet tables"""
-        print("🔄 Running fleet migration...")
+        logger.info("🔄 Running fleet migration...")
         
         create_vehicle_table = """
         CREATE TABLE IF NOT EXISTS vehicle (
@@ -531,15 +634,15 @@ class MigrationManager:
             connection.execute(text(create_transport_job_table))
             connection.commit()
             
-            print("✅ Fleet tables created successfully!")
+            logger.info("✅ Fleet tables created successfully!")
             return True
         except Exception as e:
-            print(f"⚠️ Fleet migration error: {e}")
+            logger.warning("⚠️ Fleet migration error: %s", e)
             return False
     
     def run_guest_list_migration(self, connection):
         """Create guest list table"""
-        print("🔄 Running guest list migration...")
+        logger.info("🔄 Running guest list migration...")
         
         create_guest_list_table = """
         CREATE TABLE IF NOT EXISTS guest_list (
@@ -576,15 +679,15 @@ class MigrationManager:
             connection.execute(text(create_guest_list_table))
             connection.commit()
             
-            print("✅ Guest list table created successfully!")
+            logger.info("✅ Guest list table created successfully!")
             return True
         except Exception as e:
-            print(f"⚠️ Guest list migration error: {e}")
+            logger.warning("⚠️ Guest list migration error: %s", e)
             return False
     
     def run_audit_trail_migration(self, connection):
         """Create or update audit trail table with all modules"""
-        print("🔄 Running audit trail migration...")
+        logger.info("🔄 Running audit trail migration...")
         
         create_audit_trail_table = """
         CREATE TABLE IF NOT EXISTS audit_trail (
@@ -623,7 +726,7 @@ class MigrationManager:
                 # Create the table with all modules
                 connection.execute(text(create_audit_trail_table))
                 connection.commit()
-                print("✅ Audit trail table created successfully!")
+                logger.info("✅ Audit trail table created successfully!")
             else:
                 # Table exists, check if SECURITY module is in the enum
                 result = connection.execute(text("""
@@ -636,7 +739,7 @@ class MigrationManager:
                 current_enum = result.fetchone()
                 
                 if current_enum and 'SECURITY' not in current_enum[0]:
-                    print("   Adding SECURITY module to audit_trail enum...")
+                    logger.info("   Adding SECURITY module to audit_trail enum...")
                     connection.execute(text("""
                         ALTER TABLE audit_trail 
                         MODIFY COLUMN module ENUM(
@@ -646,76 +749,58 @@ class MigrationManager:
                         ) NOT NULL
                     """))
                     connection.commit()
-                    print("✅ SECURITY module added to audit_trail!")
+                    logger.info("✅ SECURITY module added to audit_trail!")
                 else:
-                    print("✅ Audit trail table already up to date!")
+                    logger.info("✅ Audit trail table already up to date!")
             
             return True
         except Exception as e:
-            print(f"⚠️ Audit trail migration error: {e}")
+            logger.warning("⚠️ Audit trail migration error: %s", e)
             return False
     
     def run_password_reset_migration(self, connection):
         """Fix password reset tokens table"""
-        print("🔄 Running password reset tokens migration...")
+        logger.info("🔄 Running password reset tokens migration...")
         
         try:
             # Check if table exists
             if self.table_exists(connection, 'password_reset_tokens'):
                 # Delete invalid records with null user_id
-                print("   Cleaning up invalid password reset tokens...")
+                logger.info("   Cleaning up invalid password reset tokens...")
                 connection.execute(text("""
                     DELETE FROM password_reset_tokens WHERE user_id IS NULL
                 """))
                 connection.commit()
-                print("✅ Password reset tokens cleaned up!")
+                logger.info("✅ Password reset tokens cleaned up!")
             
             return True
         except Exception as e:
-            print(f"⚠️ Password reset migration error: {e}")
+            logger.warning("⚠️ Password reset migration error: %s", e)
             return False
     
     def run_purchase_order_migration(self, connection):
-        """Add extra_materials and payment_terms columns to purchase_order table"""
-        print("🔄 Running purchase order migration...")
+        """Add original_requirements, extra_materials and payment_terms columns to purchase_order table"""
+        logger.info("🔄 Running purchase order migration...")
         
         try:
             # Check if table exists
             if self.table_exists(connection, 'purchase_order'):
-                # Add extra_materials column if it doesn't exist
-                if not self.column_exists(connection, 'purchase_order', 'extra_materials'):
-                    print("   Adding extra_materials column to purchase_order table...")
-                    connection.execute(text("""
-                        ALTER TABLE purchase_order 
-                        ADD COLUMN extra_materials TEXT NULL
-                    """))
-                    connection.commit()
-                    print("✅ extra_materials column added successfully!")
-                else:
-                    print("✅ extra_materials column already exists!")
-                
-                # Add payment_terms column if it doesn't exist
-                if not self.column_exists(connection, 'purchase_order', 'payment_terms'):
-                    print("   Adding payment_terms column to purchase_order table...")
-                    connection.execute(text("""
-                        ALTER TABLE purchase_order 
-                        ADD COLUMN payment_terms VARCHAR(50) DEFAULT 'full_payment'
-                    """))
-                    connection.commit()
-                    print("✅ payment_terms column added successfully!")
-                else:
-                    print("✅ payment_terms column already exists!")
+                self.add_missing_columns(connection, 'purchase_order', [
+                    ("original_requirements", "TEXT"),
+                    ("extra_materials", "TEXT NULL"),
+                    ("payment_terms", "VARCHAR(50) DEFAULT 'full_payment'"),
+                ])
             else:
-                print("ℹ️ purchase_order table doesn't exist yet, skipping migration")
+                logger.info("ℹ️ purchase_order table doesn't exist yet, skipping migration")
             
             return True
         except Exception as e:
-            print(f"⚠️ Purchase order migration error: {e}")
+            logger.warning("⚠️ Purchase order migration error: %s", e)
             return False
 
     def run_rework_system_migration(self, connection):
         """Create rework system tables and add required columns"""
-        print("🔄 Running rework system migration...")
+        logger.info("🔄 Running rework system migration...")
         
         try:
             # Create machine_test_result table
@@ -741,12 +826,12 @@ class MigrationManager:
             """
             
             if not self.table_exists(connection, 'machine_test_result'):
-                print("   Creating machine_test_result table...")
+                logger.info("   Creating machine_test_result table...")
                 connection.execute(text(create_machine_test_result_table))
                 connection.commit()
-                print("✅ machine_test_result table created successfully!")
+                logger.info("✅ machine_test_result table created successfully!")
             else:
-                print("✅ machine_test_result table already exists!")
+                logger.info("✅ machine_test_result table already exists!")
             
             # Create rework_order table
             create_rework_order_table = """
@@ -767,83 +852,83 @@ class MigrationManager:
             """
             
             if not self.table_exists(connection, 'rework_order'):
-                print("   Creating rework_order table...")
+                logger.info("   Creating rework_order table...")
                 connection.execute(text(create_rework_order_table))
                 connection.commit()
-                print("✅ rework_order table created successfully!")
+                logger.info("✅ rework_order table created successfully!")
             else:
-                print("✅ rework_order table already exists!")
+                logger.info("✅ rework_order table already exists!")
                 
                 # Add started_at column if it doesn't exist
                 if not self.column_exists(connection, 'rework_order', 'started_at'):
-                    print("   Adding started_at column to existing rework_order table...")
+                    logger.info("   Adding started_at column to existing rework_order table...")
                     connection.execute(text("""
                         ALTER TABLE rework_order 
                         ADD COLUMN started_at DATETIME NULL
                     """))
                     connection.commit()
-                    print("✅ started_at column added to rework_order successfully!")
+                    logger.info("✅ started_at column added to rework_order successfully!")
             
             # Add rework tracking columns to machine_test_result table (if table exists but columns don't)
             if self.table_exists(connection, 'machine_test_result'):
                 # Add is_in_rework column if it doesn't exist
                 if not self.column_exists(connection, 'machine_test_result', 'is_in_rework'):
-                    print("   Adding is_in_rework column to existing machine_test_result table...")
+                    logger.info("   Adding is_in_rework column to existing machine_test_result table...")
                     connection.execute(text("""
                         ALTER TABLE machine_test_result 
                         ADD COLUMN is_in_rework BOOLEAN DEFAULT FALSE
                     """))
                     connection.commit()
-                    print("✅ is_in_rework column added successfully!")
+                    logger.info("✅ is_in_rework column added successfully!")
                 
                 # Add rework_order_id column if it doesn't exist
                 if not self.column_exists(connection, 'machine_test_result', 'rework_order_id'):
-                    print("   Adding rework_order_id column to existing machine_test_result table...")
+                    logger.info("   Adding rework_order_id column to existing machine_test_result table...")
                     connection.execute(text("""
                         ALTER TABLE machine_test_result 
                         ADD COLUMN rework_order_id INT NULL,
                         ADD INDEX idx_rework_order (rework_order_id)
                     """))
                     connection.commit()
-                    print("✅ rework_order_id column added successfully!")
+                    logger.info("✅ rework_order_id column added successfully!")
                 
                 # Add original_lot_id column if it doesn't exist
                 if not self.column_exists(connection, 'machine_test_result', 'original_lot_id'):
-                    print("   Adding original_lot_id column to existing machine_test_result table...")
+                    logger.info("   Adding original_lot_id column to existing machine_test_result table...")
                     connection.execute(text("""
                         ALTER TABLE machine_test_result 
                         ADD COLUMN original_lot_id INT NULL,
                         ADD INDEX idx_original_lot (original_lot_id)
                     """))
                     connection.commit()
-                    print("✅ original_lot_id column added successfully!")
+                    logger.info("✅ original_lot_id column added successfully!")
                 
-                print("✅ All rework tracking columns verified in machine_test_result table!")
+                logger.info("✅ All rework tracking columns verified in machine_test_result table!")
             
             # Add quantity column to showroom_product table
             if self.table_exists(connection, 'showroom_product'):
                 if not self.column_exists(connection, 'showroom_product', 'quantity'):
-                    print("   Adding quantity column to showroom_product table...")
+                    logger.info("   Adding quantity column to showroom_product table...")
                     connection.execute(text("""
                         ALTER TABLE showroom_product 
                         ADD COLUMN quantity INT DEFAULT 1
                     """))
                     connection.commit()
-                    print("✅ quantity column added to showroom_product successfully!")
+                    logger.info("✅ quantity column added to showroom_product successfully!")
                 else:
-                    print("✅ quantity column already exists in showroom_product!")
+                    logger.info("✅ quantity column already exists in showroom_product!")
             else:
-                print("ℹ️ showroom_product table doesn't exist yet, skipping showroom product migration")
+                logger.info("ℹ️ showroom_product table doesn't exist yet, skipping showroom product migration")
             
-            print("✅ Rework system migration completed successfully!")
+            logger.info("✅ Rework system migration completed successfully!")
             return True
         except Exception as e:
-            print(f"⚠️ Rework system migration error: {e}")
+            logger.warning("⚠️ Rework system migration error: %s", e)
             return False
     
     def run_transport_details_migration(self, connection):
         """Add transport details columns to sales_order table"""
-        print("🔄 Running transport details migration...")
+        logger.info("🔄 Running transport details migration...")
         
         try:
             if self.table_exists(connection, 'sales_order'):
@@ -855,30 +940,20 @@ class MigrationManager:
                     ("vehicle_type", "VARCHAR(100)")
                 ]
                 
-                for column_name, column_type in columns_to_add:
-                    if not self.column_exists(connection, 'sales_order', column_name):
-                        print(f"   Adding {column_name} column to sales_order table...")
-                        connection.execute(text(f"""
-                            ALTER TABLE sales_order 
-                            ADD COLUMN {column_name} {column_type}
-                        """))
-                        connection.commit()
-                        print(f"✅ {column_name} column added successfully!")
-                    else:
-                        print(f"✅ {column_name} column already exists!")
+                self.add_missing_columns(connection, 'sales_order', columns_to_add)
                 
-                print("✅ Transport details migration completed successfully!")
+                logger.info("✅ Transport details migration completed successfully!")
             else:
-                print("ℹ️ sales_order table doesn't exist yet, skipping transport details migration")
+                logger.info("ℹ️ sales_order table doesn't exist yet, skipping transport details migration")
             
             return True
         except Exception as e:
-            print(f"⚠️ Transport details migration error: {e}")
+            logger.warning("⚠️ Transport details migration error: %s", e)
             return False
     
     def run_payment_details_migration(self, connection):
         """Add payment details columns to sales_transaction table"""
-        print("🔄 Running payment details migration...")
+        logger.info("🔄 Running payment details migration...")
         
         try:
             if self.table_exists(connection, 'sales_transaction'):
@@ -889,30 +964,20 @@ class MigrationManager:
                     ("split_payment_details", "TEXT")
                 ]
                 
-                for column_name, column_type in columns_to_add:
-                    if not self.column_exists(connection, 'sales_transaction', column_name):
-                        print(f"   Adding {column_name} column to sales_transaction table...")
-                        connection.execute(text(f"""
-                            ALTER TABLE sales_transaction 
-                            ADD COLUMN {column_name} {column_type}
-                        """))
-                        connection.commit()
-                        print(f"✅ {column_name} column added successfully!")
-                    else:
-                        print(f"✅ {column_name} column already exists!")
+                self.add_missing_columns(connection, 'sales_transaction', columns_to_add)
                 
-                print("✅ Payment details migration completed successfully!")
+                logger.info("✅ Payment details migration completed successfully!")
             else:
-                print("ℹ️ sales_transaction table doesn't exist yet, skipping payment details migration")
+                logger.info("ℹ️ sales_transaction table doesn't exist yet, skipping payment details migration")
             
             return True
         except Exception as e:
-            print(f"⚠️ Payment details migration error: {e}")
+            logger.warning("⚠️ Payment details migration error: %s", e)
             return False
     
     def run_manager_approval_migration(self, connection):
         """Add manager approval fields to leaves table"""
-        print("🔄 Running manager approval migration...")
+        logger.info("🔄 Running manager approval migration...")
         
         try:
             if self.table_exists(connection, 'leaves'):
@@ -923,20 +988,10 @@ class MigrationManager:
                     ("manager_notes", "TEXT")
                 ]
                 
-                for column_name, column_type in columns_to_add:
-                    if not self.column_exists(connection, 'leaves', column_name):
-                        print(f"   Adding {column_name} column to leaves table...")
-                        connection.execute(text(f"""
-                            ALTER TABLE leaves 
-                            ADD COLUMN {column_name} {column_type}
-                        """))
-                        connection.commit()
-                        print(f"✅ {column_name} column added successfully!")
-                    else:
-                        print(f"✅ {column_name} column already exists!")
+                self.add_missing_columns(connection, 'leaves', columns_to_add)
                 
                 # Update enum to include new statuses
-                print("   Updating leave status enum...")
+                logger.info("   Updating leave status enum...")
                 try:
                     connection.execute(text("""
                         ALTER TABLE leaves 
@@ -944,22 +999,22 @@ class MigrationManager:
                         DEFAULT 'PENDING'
                     """))
                     connection.commit()
-                    print("✅ Leave status enum updated successfully!")
+                    logger.info("✅ Leave status enum updated successfully!")
                 except Exception as enum_error:
-                    print(f"ℹ️ Enum update skipped (may already be updated): {enum_error}")
+                    logger.info("ℹ️ Enum update skipped (may already be updated): %s", enum_error)
                 
-                print("✅ Manager approval migration completed successfully!")
+                logger.info("✅ Manager approval migration completed successfully!")
             else:
-                print("ℹ️ leaves table doesn't exist yet, skipping manager approval migration")
+                logger.info("ℹ️ leaves table doesn't exist yet, skipping manager approval migration")
             
             return True
         except Exception as e:
-            print(f"⚠️ Manager approval migration error: {e}")
+            logger.warning("⚠️ Manager approval migration error: %s", e)
             return False
     
     def run_tour_management_approval_migration(self, connection):
         """Add management approval fields to tour_intimations table"""
-        print("🔄 Running tour management approval migration...")
+        logger.info("🔄 Running tour management approval migration...")
         
         try:
             if self.table_exists(connection, 'tour_intimations'):
@@ -970,20 +1025,10 @@ class MigrationManager:
                     ("management_notes", "TEXT")
                 ]
                 
-                for column_name, column_type in columns_to_add:
-                    if not self.column_exists(connection, 'tour_intimations', column_name):
-                        print(f"   Adding {column_name} column to tour_intimations table...")
-                        connection.execute(text(f"""
-                            ALTER TABLE tour_intimations 
-                            ADD COLUMN {column_name} {column_type}
-                        """))
-                        connection.commit()
-                        print(f"✅ {column_name} column added successfully!")
-                    else:
-                        print(f"✅ {column_name} column already exists!")
+                self.add_missing_columns(connection, 'tour_intimations', columns_to_add)
                 
                 # Update enum to include new statuses
-                print("   Updating tour status enum...")
+                logger.info("   Updating tour status enum...")
                 try:
                     connection.execute(text("""
                         ALTER TABLE tour_intimations 
@@ -991,22 +1036,22 @@ class MigrationManager:
                         DEFAULT 'PENDING'
                     """))
                     connection.commit()
-                    print("✅ Tour status enum updated successfully!")
+                    logger.info("✅ Tour status enum updated successfully!")
                 except Exception as enum_error:
-                    print(f"ℹ️ Enum update skipped (may already be updated): {enum_error}")
+                    logger.info("ℹ️ Enum update skipped (may already be updated): %s", enum_error)
                 
-                print("✅ Tour management approval migration completed successfully!")
+                logger.info("✅ Tour management approval migration completed successfully!")
             else:
-                print("ℹ️ tour_intimations table doesn't exist yet, skipping tour management approval migration")
+                logger.info("ℹ️ tour_intimations table doesn't exist yet, skipping tour management approval migration")
             
             return True
         except Exception as e:
-            print(f"⚠️ Tour management approval migration error: {e}")
+            logger.warning("⚠️ Tour management approval migration error: %s", e)
             return False
     
     def run_leave_approved_by_fix_migration(self, connection):
         """Fix leave approved_by foreign key constraint - make it nullable"""
-        print("🔄 Running leave approved_by constraint fix migration...")
+        logger.info("🔄 Running leave approved_by constraint fix migration...")
         
         try:
             if self.table_exists(connection, 'leaves'):
@@ -1024,47 +1069,173 @@ class MigrationManager:
                 
                 if constraint:
                     constraint_name = constraint[0]
-                    print(f"   Found foreign key constraint: {constraint_name}")
+                    logger.info("   Found foreign key constraint: %s", constraint_name)
                     
                     # Drop the foreign key constraint
-                    print(f"   Dropping foreign key constraint {constraint_name}...")
+                    logger.info("   Dropping foreign key constraint %s...", constraint_name)
                     connection.execute(text(f"ALTER TABLE leaves DROP FOREIGN KEY {constraint_name}"))
                     connection.commit()
-                    print("✅ Foreign key constraint dropped!")
+                    logger.info("✅ Foreign key constraint dropped!")
                 else:
-                    print("ℹ️ No foreign key constraint found on approved_by")
+                    logger.info("ℹ️ No foreign key constraint found on approved_by")
                 
                 # Make approved_by nullable
-                print("   Making approved_by column nullable...")
+                logger.info("   Making approved_by column nullable...")
                 connection.execute(text("""
                     ALTER TABLE leaves 
                     MODIFY COLUMN approved_by INTEGER NULL
                 """))
                 connection.commit()
-                print("✅ approved_by column is now nullable!")
+                logger.info("✅ approved_by column is now nullable!")
+                
+                logger.info("✅ Leave approved_by constraint fix completed successfully!")
+                logger.info("   HR users can now approve leaves without employee records")
+            else:
+                logger.info("ℹ️ leaves table doesn't exist yet, skipping leave approved_by fix migration")
+            
+            return True
+        except Exception as e:
+            logger.warning("⚠️ Leave approved_by fix migration error: %s", e)
+            return False
+    
+    def run_gate_user_face_encoding_migration(self, connection):
+        """Store gate_users.face_encoding as a MEDIUMBLOB of packed uint8 encodings"""
+        logger.info("🔄 Running gate user face encoding migration...")
+        
+        try:
+            if not self.table_exists(connection, 'gate_users'):
+                logger.info("ℹ️ gate_users table doesn't exist yet, skipping face encoding migration")
+                return True
+            
+            data_type = connection.execute(text("""
+                SELECT DATA_TYPE
+                FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE()
+                AND TABLE_NAME = 'gate_users'
+                AND COLUMN_NAME = 'face_encoding'
+            """)).scalar()
+            
+            if data_type is not None and data_type.lower() != 'mediumblob':
+                # Fail fast instead of queueing behind long-running transactions
+                connection.execute(text("SET SESSION lock_wait_timeout = 30"))
+                row_count = connection.execute(text("SELECT COUNT(*) FROM gate_users")).scalar() or 0
+                logger.info("   Converting face_encoding from %s to MEDIUMBLOB (%s rows)...", data_type, row_count)
+                
+                try:
+                    connection.execute(text("""
+                        ALTER TABLE gate_users
+                        MODIFY COLUMN face_encoding MEDIUMBLOB NULL,
+                        ALGORITHM=INPLACE, LOCK=NONE
+                    """))
+                    connection.commit()
+                except Exception as inplace_error:
+                    connection.rollback()
+                    logger.info("ℹ️ Online ALTER not supported (%s), falling back to table copy", inplace_error)
+                    for attempt in range(1, 4):
+                        try:
+                            started = time.monotonic()
+                            connection.execute(text("""
+                                ALTER TABLE gate_users
+                                MODIFY COLUMN face_encoding MEDIUMBLOB NULL
+                            """))
+                            connection.commit()
+                            logger.info("   Table copy finished in %.1fs", time.monotonic() - started)
+                            break
+                        except Exception as alter_error:
+                            connection.rollback()
+                            if attempt == 3:
+                                raise
+                            logger.warning("⚠️ ALTER attempt %s failed (%s), retrying...", attempt, alter_error)
+                            time.sleep(5 * attempt)
                 
-                print("✅ Leave approved_by constraint fix completed successfully!")
-                print("   HR users can now approve leaves without employee records")
+                logger.info("✅ gate_users.face_encoding converted to MEDIUMBLOB!")
+            
+            # Re-encode legacy JSON rows as .npy blobs, 500 rows per transaction
+            from utils.face_recognition_utils import serialize_face_encodings, deserialize_face_encodings
+            last_id = 0
+            converted = 0
+            while True:
+                rows = connection.execute(text("""
+                    SELECT id, face_encoding FROM gate_users
+                    WHERE id > :last_id AND face_encoding LIKE '[%'
+                    ORDER BY id
+                    LIMIT 500
+                """), {"last_id": last_id}).fetchall()
+                if not rows:
+                    break
+                
+                for user_id, stored_encoding in rows:
+                    last_id = user_id
+                    try:
+                        packed = serialize_face_encodings(deserialize_face_encodings(stored_encoding))
+                    except Exception as convert_error:
+                        logger.warning("⚠️ Could not convert face encoding for gate user %s: %s", user_id, convert_error)
+                        continue
+                    connection.execute(
+                        text("UPDATE gate_users SET face_encoding = :encoding WHERE id = :id"),
+                        {"encoding": packed, "id": user_id}
+                    )
+                    converted += 1
+                connection.commit()
+                logger.info("   Converted %s face encodings so far...", converted)
+            
+            if converted:
+                logger.info("✅ %s legacy JSON face encodings converted to binary!", converted)
             else:
-                print("ℹ️ leaves table doesn't exist yet, skipping leave approved_by fix migration")
+                logger.info("✅ gate_users.face_encoding already up to date!")
+            return True
+        except Exception as e:
+            logger.warning("⚠️ Gate user face encoding migration error: %s", e)
+            return False
+    
+    def run_index_migration(self, connection):
+        """Add indexes backing hot lookups on existing tables"""
+        logger.info("🔄 Running index migration...")
+        
+        # table -> [(index_name, columns)]; names match the SQLAlchemy models
+        indexes = {
+            'users': [
+                ('ix_users_department', 'department'),
+                ('ix_users_status', 'status'),
+            ],
+            'sales_order': [
+                ('ix_sales_order_status_created', 'order_status, created_at'),
+            ],
+            'gate_pass': [
+                ('ix_gate_pass_status_issued', 'status, issued_at'),
+                ('ix_gate_pass_issued_at', 'issued_at'),
+            ],
+            'guest_list': [
+                ('ix_guest_list_status_visit_date', 'status, visit_date'),
+                ('ix_guest_list_visit_date_created', 'visit_date, created_at'),
+            ],
+        }
+        
+        try:
+            for table_name, table_indexes in indexes.items():
+                if self.table_exists(connection, table_name):
+                    self.add_missing_indexes(connection, table_name, table_indexes)
             
+            logger.info("✅ Index migration completed successfully!")
             return True
         except Exception as e:
-            print(f"⚠️ Leave approved_by fix migration error: {e}")
+            logger.warning("⚠️ Index migration error: %s", e)
             return False
     
     def run_all_migrations(self):
         """Run all migrations in the correct order"""
-        print("\n" + "=" * 60)
-        print("🚀 Starting Automatic Database Migrations")
-        print("=" * 60 + "\n")
+        logger.info("=" * 60)
+        logger.info("🚀 Starting Automatic Database Migrations")
+        logger.info("=" * 60)
         
         if not self.engine:
-            print("❌ Database engine not initialized")
+            logger.error("❌ Database engine not initialized")
             return False
         
         try:
             with self.engine.connect() as connection:
+                self.load_applied_migrations(connection)
+                
                 # Run migrations in order (respecting dependencies)
                 self.run_audit_trail_migration(connection)  # Run first to ensure audit table exists
                 self.run_password_reset_migration(connection)  # Clean up invalid password reset tokens
@@ -1081,17 +1252,21 @@ class MigrationManager:
                 self.run_manager_approval_migration(connection)  # Add manager approval fields to leaves table
                 self.run_tour_management_approval_migration(connection)  # Add management approval fields to tour_intimations table
                 self.run_leave_approved_by_fix_migration(connection)  # Fix leave approved_by constraint to allow HR users without employee records
+                self.run_gate_user_face_encoding_migration(connection)  # Store gate_users.face_encoding as packed binary
+                self.run_index_migration(connection)  # Add indexes backing hot lookups
                 
-                print("\n" + "=" * 60)
-                print("✅ All migrations completed successfully!")
-                print("=" * 60 + "\n")
+                logger.info("=" * 60)
+                logger.info("✅ All migrations completed successfully!")
+                logger.info("=" * 60)
                 return True
                 
         except Exception as e:
-            print(f"\n❌ Migration error: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("❌ Migration error: %s", e)
             return False
+        finally:
+            # Release the migration engine's pooled connection so it is not
+            # held for the process lifetime (or inherited by forked workers)
+            self.engine.dispose()
 
 
 # Global instance
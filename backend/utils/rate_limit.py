@@ -0,0 +1,21 @@
+"""
+Rate limiting for authentication endpoints (Flask-Limiter)
+"""
+from flask import request
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+
+
+def client_and_identity_key():
+    """Rate-limit key combining the client IP and the submitted username/email"""
+    data = request.get_json(silent=True)
+    identity = ""
+    if isinstance(data, dict):
+        identity = str(data.get("username") or data.get("email") or data.get("token") or "")[:255]
+    return f"{get_remote_address()}:{identity.strip().lower()}"
+
+
+# Keyed on remote_addr, which ProxyFix rewrites from trusted proxy hops only
+# (PROXY_FIX_X_FOR); a client-supplied X-Forwarded-For is never trusted here.
+# Storage comes from RATELIMIT_STORAGE_URI (Redis shares counters across workers)
+limiter = Limiter(key_func=get_remote_address)
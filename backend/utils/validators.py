@@ -2,7 +2,9 @@
 Input validation utility functions
 """
 import re
+from functools import wraps
 from typing import Dict, List, Any
+from flask import request, jsonify
 
 def validate_required_fields(data: Dict[str, Any], required_fields: List[str]) -> None:
     """
@@ -24,6 +26,30 @@ def validate_required_fields(data: Dict[str, Any], required_fields: List[str]) -
     if missing_fields:
         raise ValueError(f'Missing required fields: {", ".join(missing_fields)}')
 
+def require_json_fields(*required_fields: str, message: str = '{field} is required'):
+    """
+    Decorator rejecting requests whose JSON body lacks a required field
+    
+    Args:
+        required_fields: Field names that must be present in the body
+        message: Error message template, formatted with the missing field
+        
+    Returns:
+        A 400 response naming the first missing field, before the view runs
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict):
+                data = {}
+            for field in required_fields:
+                if field not in data:
+                    return jsonify({'error': message.format(field=field)}), 400
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
 def validate_email(email: str) -> bool:
     """
     Validate email format